@@ -2,13 +2,14 @@ from __future__ import annotations
 import os
 import json
 import time
+from dataclasses import replace
 from datetime import datetime
 from dotenv import load_dotenv
 import streamlit as st
 
 from ollama.client import chat as ollama_chat, chat_stream, health_check, OllamaConnectionError
 from models import registry
-from personas.presets import PRESETS, CLASS_FLAVOR, SPEC_BEHAVIOR, CLASS_AVATAR
+from personas.presets import PRESETS, PRESETS_BY_KEY, PRESET_KEYS, CLASS_FLAVOR, SPEC_BEHAVIOR, CLASS_AVATAR
 from personas.prompt_builder import PersonaConfig, build_system_prompt, PersonaValidationError, PersonaValidationError
 from conversations import Conversation, ConversationManager
 from themes import theme_manager
@@ -120,9 +121,11 @@ with col_theme2:
 with col_theme3:
     st.caption("💡 Tip: Try different themes and class colors for unique experiences!")
 
-# Apply theme (will be updated after persona selection)
+# Apply theme; class colors replace the variables in the same slot once the class is chosen
 current_theme = theme_manager.get_theme(st.session_state.theme)
-theme_manager.apply_theme_css(current_theme)
+theme_manager.apply_base_css()
+theme_slot = st.empty()
+theme_manager.apply_theme_css(current_theme, container=theme_slot)
 
 left, right = st.columns([1, 2])
 
@@ -152,7 +155,7 @@ with left:
         default_avatar = loaded_cfg.avatar
     else:
         # Use preset defaults
-        preset = next(p for p in PRESETS if p.key == st.session_state.selected_preset)
+        preset = PRESETS_BY_KEY[st.session_state.selected_preset]
         default_preset_key = st.session_state.selected_preset
         default_version = DEFAULT_VERSION
         default_name = preset.name
@@ -171,9 +174,9 @@ with left:
     
     selected_preset_key = st.selectbox(
         "Preset",
-        options=[p.key for p in PRESETS],
+        options=list(PRESETS_BY_KEY),
         format_func=lambda k: preset_titles[k],
-        index=[p.key for p in PRESETS].index(default_preset_key) if default_preset_key in [p.key for p in PRESETS] else 0,
+        index=list(PRESETS_BY_KEY).index(default_preset_key) if default_preset_key in PRESET_KEYS else 0,
     )
     
     # Clear loaded config if user selects a different preset
@@ -184,7 +187,7 @@ with left:
     
     # Only update defaults if not using loaded config
     if "loaded_config" not in st.session_state:
-        preset = next(p for p in PRESETS if p.key == selected_preset_key)
+        preset = PRESETS_BY_KEY[selected_preset_key]
         default_name = preset.name
         default_cls = preset.cls
         default_spec = preset.spec
@@ -297,7 +300,7 @@ with left:
     # Apply class-specific theme colors if enabled
     if st.session_state.use_class_theme:
         class_colors = theme_manager.get_class_theme(cls)
-        theme_manager.apply_theme_css(current_theme, class_colors)
+        theme_manager.apply_theme_css(current_theme, class_colors, container=theme_slot)
 
     # Enhanced Persona Badge with styling
     st.markdown("### 👤 Persona Badge")
@@ -328,7 +331,7 @@ with left:
                 step=1000,
                 help="Maximum tokens to keep in context window"
             )
-            st.session_state.memory_config.max_context_tokens = max_tokens
+            st.session_state.memory_config = replace(st.session_state.memory_config, max_context_tokens=max_tokens)
 
             compression_threshold = st.slider(
                 "Compression Threshold (%)",
@@ -338,7 +341,10 @@ with left:
                 step=5,
                 help="When to start compressing context"
             )
-            st.session_state.memory_config.summarize_threshold = int((compression_threshold / 100.0) * st.session_state.memory_config.max_context_tokens)
+            st.session_state.memory_config = replace(
+                st.session_state.memory_config,
+                summarize_threshold=int((compression_threshold / 100.0) * st.session_state.memory_config.max_context_tokens)
+            )
 
         with col_mem2:
             context_strategy = st.selectbox(
@@ -357,7 +363,7 @@ with left:
                 step=25,
                 help="Length of conversation summaries"
             )
-            st.session_state.memory_config.summary_length = summary_length
+            st.session_state.memory_config = replace(st.session_state.memory_config, summary_length=summary_length)
 
         # Context usage indicator
         if st.session_state.msgs:
@@ -512,7 +518,7 @@ with left:
         # Load conversation dropdown
         saved_conversations = conversation_manager.list_conversations()
         if saved_conversations:
-            conversation_options = ["Choose a conversation..."] + [f"{c.title} ({c.updated_at[:10]})" for c in saved_conversations]
+            conversation_options = ["Choose a conversation..."] + [f"{c.title} ({c.get_updated_at()[:10]})" for c in saved_conversations]
             selected_conversation_display = st.selectbox(
                 "Load Conversation",
                 options=conversation_options
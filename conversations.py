@@ -4,19 +4,51 @@ Conversation management for the persona chat app.
 from __future__ import annotations
 import os
 import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from pathlib import Path
 
+# Wall-clock anchor for monotonic message times: wall ns = anchor wall + (monotonic ns - anchor monotonic).
+# Re-taken after _REANCHOR_NS so NTP steps, slew and suspend don't accumulate into the timestamps.
+_ANCHOR_NS = (time.time_ns(), time.monotonic_ns())
+_REANCHOR_NS = 60 * 1_000_000_000
 
-@dataclass
+
+# Shared compact encoder for saved and exported conversations (C fast path, emoji kept as UTF-8)
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def _now_ns() -> int:
+    """Current wall-clock time in ns, derived from the monotonic clock."""
+    global _ANCHOR_NS
+    wall, mono = _ANCHOR_NS
+    now = time.monotonic_ns()
+    if now - mono > _REANCHOR_NS:
+        wall = time.time_ns()
+        _ANCHOR_NS = (wall, now)
+        return wall
+    return wall + (now - mono)
+
+
+def _format_ns(ns: int) -> str:
+    """Format a wall-clock ns time like datetime.isoformat()."""
+    seconds, rem = divmod(ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=rem // 1000).isoformat()
+
+
+@dataclass(slots=True)
 class ConversationMessage:
     """A single message in a conversation."""
     role: str
     content: str
-    timestamp: str
+    timestamp: Optional[str]  # ISO time; None until first needed for messages from add_message()
     avatar: Optional[str] = None
+    # Wall-clock ns for a timestamp that is formatted lazily
+    created_ns: Optional[int] = field(default=None, repr=False, compare=False)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> ConversationMessage:
@@ -28,12 +60,23 @@ class ConversationMessage:
             avatar=data.get("avatar")
         )
 
+    def get_timestamp(self) -> str:
+        """Get the ISO timestamp, formatting it on first use."""
+        if self.timestamp is None:
+            self.timestamp = _format_ns(self.created_ns) if self.created_ns is not None else ""
+        return self.timestamp
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert message to dictionary."""
-        return asdict(self)
+        return {
+            "role": self.role,
+            "content": self.content,
+            "timestamp": self.get_timestamp(),
+            "avatar": self.avatar,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class Conversation:
     """A conversation with metadata and messages."""
     id: str
@@ -44,9 +87,11 @@ class Conversation:
     provider_name: str
     model_name: str
     created_at: str
-    updated_at: str
+    updated_at: Optional[str]  # ISO time; None until first needed after add_message()
     messages: List[ConversationMessage]
     tags: List[str] = None
+    # Wall-clock ns of the last add_message(), formatted into updated_at lazily
+    updated_ns: Optional[int] = field(default=None, repr=False, compare=False)
 
     def __post_init__(self):
         if self.tags is None:
@@ -63,10 +108,9 @@ class Conversation:
         title: Optional[str] = None
     ) -> Conversation:
         """Create a new conversation."""
-        now = datetime.now()
-        now_iso = now.isoformat()
-        # Use microseconds for unique ID
-        conversation_id = f"conv_{int(now.timestamp() * 1000000)}"
+        now_iso = datetime.now().isoformat()
+        # Random ID: unique even for conversations created in the same microsecond
+        conversation_id = "conv_" + uuid.uuid4().hex
 
         if not title:
             title = f"Chat with {persona_name} ({now_iso[:19]})"
@@ -102,22 +146,33 @@ class Conversation:
             tags=data.get("tags", [])
         )
 
+    def get_updated_at(self) -> str:
+        """Get the ISO last-update time, formatting it on first use."""
+        if self.updated_at is None:
+            self.updated_at = _format_ns(self.updated_ns) if self.updated_ns is not None else ""
+        return self.updated_at
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert conversation to dictionary."""
         data = asdict(self)
+        del data["updated_ns"]
+        data["updated_at"] = self.get_updated_at()
         data["messages"] = [msg.to_dict() for msg in self.messages]
         return data
 
     def add_message(self, role: str, content: str, avatar: Optional[str] = None):
         """Add a message to the conversation."""
+        now_ns = _now_ns()
         message = ConversationMessage(
             role=role,
             content=content,
-            timestamp=datetime.now().isoformat(),
-            avatar=avatar
+            timestamp=None,
+            avatar=avatar,
+            created_ns=now_ns
         )
         self.messages.append(message)
-        self.updated_at = datetime.now().isoformat()
+        self.updated_at = None
+        self.updated_ns = now_ns
 
     def get_messages_for_chat(self) -> List[Dict[str, str]]:
         """Get messages in the format expected by chat functions."""
@@ -144,8 +199,9 @@ class ConversationManager:
     def save_conversation(self, conversation: Conversation) -> str:
         """Save a conversation to disk."""
         filepath = self.conversations_dir / f"{conversation.id}.json"
+        text = _JSON_ENCODER.encode(conversation.to_dict())
         with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(conversation.to_dict(), f, indent=2, ensure_ascii=False)
+            f.write(text)
         return str(filepath)
 
     def load_conversation(self, conversation_id: str) -> Optional[Conversation]:
@@ -161,19 +217,29 @@ class ConversationManager:
         except Exception:
             return None
 
+    @staticmethod
+    def _load_file(path: str) -> Optional[Conversation]:
+        """Load one conversation file, or None if it can't be read."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return Conversation.from_dict(data)
+        except Exception:
+            return None
+
     def list_conversations(self) -> List[Conversation]:
         """List all saved conversations."""
-        conversations = []
-        for filepath in self.conversations_dir.glob("*.json"):
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                conversations.append(Conversation.from_dict(data))
-            except Exception:
-                continue
+        with os.scandir(self.conversations_dir) as entries:
+            paths = [entry.path for entry in entries if entry.name.endswith(".json") and entry.is_file()]
+        if not paths:
+            return []
+
+        # File reads overlap across threads, so listing time tracks the slowest file rather than the sum
+        with ThreadPoolExecutor(max_workers=min(8, len(paths))) as executor:
+            conversations = [c for c in executor.map(self._load_file, paths) if c is not None]
 
         # Sort by updated_at descending
-        conversations.sort(key=lambda c: c.updated_at, reverse=True)
+        conversations.sort(key=Conversation.get_updated_at, reverse=True)
         return conversations
 
     def delete_conversation(self, conversation_id: str) -> bool:
@@ -191,38 +257,39 @@ class ConversationManager:
             return None
 
         if format == "json":
-            return json.dumps(conversation.to_dict(), indent=2, ensure_ascii=False)
+            return _JSON_ENCODER.encode(conversation.to_dict())
         elif format == "txt":
-            lines = [f"Conversation: {conversation.title}"]
-            lines.append(f"Persona: {conversation.persona_name} ({conversation.persona_class}/{conversation.persona_spec})")
-            lines.append(f"Model: {conversation.provider_name} - {conversation.model_name}")
-            lines.append(f"Created: {conversation.created_at}")
-            lines.append("")
-            lines.append("Messages:")
-            lines.append("-" * 50)
-
-            for msg in conversation.messages:
-                timestamp = msg.timestamp[:19] if msg.timestamp else ""
-                avatar = msg.avatar or ("🤖" if msg.role == "assistant" else "👤")
-                lines.append(f"[{timestamp}] {avatar} {msg.role.title()}: {msg.content}")
-                lines.append("")
-
-            return "\n".join(lines)
+            header = "\n".join((
+                f"Conversation: {conversation.title}",
+                f"Persona: {conversation.persona_name} ({conversation.persona_class}/{conversation.persona_spec})",
+                f"Model: {conversation.provider_name} - {conversation.model_name}",
+                f"Created: {conversation.created_at}",
+                "",
+                "Messages:",
+                "-" * 50,
+            ))
+            # Each message is its line followed by a blank line
+            body = "".join([
+                f"\n[{msg.get_timestamp()[:19]}] {msg.avatar or ('🤖' if msg.role == 'assistant' else '👤')} "
+                f"{msg.role.title()}: {msg.content}\n"
+                for msg in conversation.messages
+            ])
+            return header + body
         elif format == "markdown":
-            lines = [f"# {conversation.title}"]
-            lines.append("")
-            lines.append(f"**Persona:** {conversation.persona_name} ({conversation.persona_class}/{conversation.persona_spec})")
-            lines.append(f"**Model:** {conversation.provider_name} - {conversation.model_name}")
-            lines.append(f"**Created:** {conversation.created_at}")
-            lines.append("")
-            lines.append("## Messages")
-            lines.append("")
-
-            for msg in conversation.messages:
-                avatar = msg.avatar or ("🤖" if msg.role == "assistant" else "👤")
-                lines.append(f"**{avatar} {msg.role.title()}:** {msg.content}")
-                lines.append("")
-
-            return "\n".join(lines)
+            header = "\n".join((
+                f"# {conversation.title}",
+                "",
+                f"**Persona:** {conversation.persona_name} ({conversation.persona_class}/{conversation.persona_spec})",
+                f"**Model:** {conversation.provider_name} - {conversation.model_name}",
+                f"**Created:** {conversation.created_at}",
+                "",
+                "## Messages",
+                "",
+            ))
+            body = "".join([
+                f"\n**{msg.avatar or ('🤖' if msg.role == 'assistant' else '👤')} {msg.role.title()}:** {msg.content}\n"
+                for msg in conversation.messages
+            ])
+            return header + body
 
         return None
\ No newline at end of file
@@ -3,17 +3,24 @@ Instrumentation and diagnostics utilities for the Persona Creator app.
 Provides comprehensive logging, performance monitoring, and debugging tools.
 """
 
+import atexit
 import logging
+import sys
+import threading
 import time
 import json
-import psutil
-import platform
 from datetime import datetime
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, asdict
-from contextlib import contextmanager
+from typing import Dict, Any, Optional, List, Iterable
+from collections import Counter, deque
+from itertools import islice
+from dataclasses import dataclass, asdict, is_dataclass
 import streamlit as st
 
+try:
+    import orjson  # serialises dataclasses natively, much faster for large exports
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -26,7 +33,60 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Log records waiting for the background writer:
+# (timestamp, operation, success, duration, error, metadata). Oldest are dropped when full.
+_LOG_QUEUE: deque = deque(maxlen=10_000)
+_LOG_FLUSH_INTERVAL_S = 0.1
+_flush_thread: Optional[threading.Thread] = None
+_flush_thread_lock = threading.Lock()
+_flush_lock = threading.Lock()
+
+_NS_PER_S = 1_000_000_000
+
+
+def flush_logs() -> None:
+    """Write all queued operation records to the logger."""
+    # Serialised so a caller's flush returns only after in-flight records are written
+    with _flush_lock:
+        while _LOG_QUEUE:
+            timestamp, operation, success, duration, error, metadata = _LOG_QUEUE.popleft()
+            log_data = {
+                "timestamp": datetime.fromtimestamp(timestamp).isoformat(),
+                "operation": operation,
+                "success": success,
+                "duration": duration,
+                "error": str(error) if error else None,
+                **metadata
+            }
+            try:
+                if success:
+                    logger.info(f"Operation completed: {operation}", extra=log_data)
+                else:
+                    logger.error(f"Operation failed: {operation}", extra=log_data)
+            except Exception:
+                # A bad metadata key must not stop the writer thread
+                logger.exception(f"Could not log operation: {operation}")
+
+
+def _flush_loop() -> None:
+    while True:
+        time.sleep(_LOG_FLUSH_INTERVAL_S)
+        flush_logs()
+
+
+def _ensure_flush_thread() -> None:
+    """Start the background log writer on first use."""
+    global _flush_thread
+    if _flush_thread is None:
+        with _flush_thread_lock:
+            if _flush_thread is None:
+                _flush_thread = threading.Thread(
+                    target=_flush_loop, name="instrumentation-log-flush", daemon=True
+                )
+                _flush_thread.start()
+                atexit.register(flush_logs)
+
+@dataclass(slots=True)
 class PerformanceMetrics:
     """Performance metrics for operations."""
     operation: str
@@ -41,7 +101,7 @@ class PerformanceMetrics:
         if self.metadata is None:
             self.metadata = {}
 
-@dataclass
+@dataclass(slots=True)
 class SystemInfo:
     """System information for diagnostics."""
     platform: str
@@ -51,97 +111,169 @@ class SystemInfo:
     memory_available: str
     disk_usage: str
 
+class _TimedOp:
+    """Context manager returned by InstrumentationManager.time_operation."""
+
+    __slots__ = ("manager", "operation", "metadata", "start")
+
+    def __init__(self, manager: "InstrumentationManager", operation: str, metadata: Dict[str, Any]):
+        self.manager = manager
+        self.operation = operation
+        self.metadata = metadata
+
+    def __enter__(self) -> "_TimedOp":
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        duration = (time.perf_counter_ns() - self.start) / _NS_PER_S
+        if exc_type is None:
+            self.manager.log_operation(self.operation, True, duration, metadata=self.metadata)
+        elif issubclass(exc_type, Exception):
+            self.manager.log_operation(self.operation, False, duration, exc, metadata=self.metadata)
+        return False  # never swallow the exception
+
 class InstrumentationManager:
     """Central manager for application instrumentation."""
 
+    # Most recent metrics / errors kept for display; older entries are dropped
+    MAX_METRICS = 10_000
+    MAX_ERRORS = 1_000
+
     def __init__(self):
-        self.metrics: List[PerformanceMetrics] = []
-        self.errors: List[Dict[str, Any]] = []
+        self.metrics: deque = deque(maxlen=self.MAX_METRICS)
+        self.errors: deque = deque(maxlen=self.MAX_ERRORS)
         self.start_time = time.time()
+        # Set to False to skip metric collection (e.g. when benchmarking)
+        self.enabled = True
+        # System info is gathered once; see get_system_info(refresh=True)
+        self._system_info: Optional[SystemInfo] = None
+        # Lifetime aggregates, updated per operation so summaries don't rescan the metrics
+        self._lock = threading.Lock()
+        self._total_ops = 0
+        self._successful_ops = 0
+        # Durations are summed as integer nanoseconds so the totals don't accumulate float error
+        self._duration_sum_ns = 0
+        self._total_errors = 0
+        self._error_types: Counter = Counter()
+        # operation -> [count, total duration in ns, errors]
+        self._op_stats: Dict[str, List[int]] = {}
 
     def log_operation(self, operation: str, success: bool, duration: float = None,
-                     error: Exception = None, **metadata):
-        """Log an operation with performance metrics."""
+                     error: Exception = None, metadata: Optional[Dict[str, Any]] = None,
+                     **extra):
+        """Log an operation with performance metrics.
+
+        Metadata can be given as keyword arguments or, on hot paths, as a
+        pre-built ``metadata`` dict (which is stored as-is).
+        """
+        if not self.enabled:
+            return
+
         if duration is None:
             duration = 0.0
 
+        end_time = time.time()
         metric = PerformanceMetrics(
             operation=operation,
-            start_time=time.time() - duration,
-            end_time=time.time(),
+            start_time=end_time - duration,
+            end_time=end_time,
             duration=duration,
             success=success,
             error_message=str(error) if error else None,
-            metadata=metadata
+            metadata=extra if metadata is None else metadata
         )
 
-        self.metrics.append(metric)
+        with self._lock:
+            self._record(metric)
+        _ensure_flush_thread()
 
-        # Log to file
-        log_data = {
-            "timestamp": datetime.now().isoformat(),
-            "operation": operation,
-            "success": success,
-            "duration": duration,
-            "error": str(error) if error else None,
-            **metadata
-        }
+    def log_batch(self, events: Iterable[PerformanceMetrics]) -> None:
+        """Record several already-built metrics under a single lock acquisition."""
+        if not self.enabled:
+            return
 
-        if success:
-            logger.info(f"Operation completed: {operation}", extra=log_data)
-        else:
-            logger.error(f"Operation failed: {operation}", extra={"error": str(error), **log_data})
-            self.errors.append(log_data)
+        with self._lock:
+            for metric in events:
+                self._record(metric)
+        _ensure_flush_thread()
+
+    def _record(self, metric: PerformanceMetrics) -> None:
+        """Store one metric and update the aggregates. Caller must hold self._lock."""
+        operation = metric.operation
+        duration = metric.duration
 
-    @contextmanager
-    def time_operation(self, operation: str, **metadata):
+        self.metrics.append(metric)
+        duration_ns = round(duration * _NS_PER_S)
+        self._total_ops += 1
+        self._duration_sum_ns += duration_ns
+        stats = self._op_stats.get(operation)
+        if stats is None:
+            stats = self._op_stats[operation] = [0, 0, 0]
+        stats[0] += 1
+        stats[1] += duration_ns
+        if metric.success:
+            self._successful_ops += 1
+        else:
+            stats[2] += 1
+            error_entry = {
+                "timestamp": datetime.fromtimestamp(metric.end_time).isoformat(),
+                "operation": operation,
+                "success": False,
+                "duration": duration,
+                "error": metric.error_message,
+                **metric.metadata
+            }
+            self.errors.append(error_entry)
+            self._total_errors += 1
+            # Errors are grouped by message prefix ("OpenAI API error: ..."); a handful of
+            # distinct interned names, so counting them is cheap
+            error_type = sys.intern((error_entry.get("error") or "Unknown").split(":", 1)[0])
+            self._error_types[error_type] += 1
+
+        # Logging happens on the background writer, off the request path
+        _LOG_QUEUE.append((metric.end_time, operation, metric.success, duration,
+                           metric.error_message, metric.metadata))
+
+    def time_operation(self, operation: str, **metadata) -> "_TimedOp":
         """Context manager to time operations."""
-        start_time = time.time()
-        try:
-            yield
-            duration = time.time() - start_time
-            self.log_operation(operation, True, duration, **metadata)
-        except Exception as e:
-            duration = time.time() - start_time
-            self.log_operation(operation, False, duration, e, **metadata)
-            raise
+        return _TimedOp(self, operation, metadata)
 
     def get_recent_metrics(self, limit: int = 50) -> List[PerformanceMetrics]:
         """Get recent performance metrics."""
-        return list(reversed(self.metrics[-limit:]))
+        return list(islice(reversed(self.metrics), limit))
 
     def get_error_summary(self) -> Dict[str, Any]:
         """Get error summary statistics."""
-        if not self.errors:
+        with self._lock:
+            if not self._total_errors:
+                return {
+                    "total_errors": 0,
+                    "error_rate": 0.0,
+                    "error_types": {},
+                    "recent_errors": []
+                }
+
             return {
-                "total_errors": 0,
-                "error_rate": 0.0,
-                "error_types": {},
-                "recent_errors": []
+                "total_errors": self._total_errors,
+                "error_rate": self._total_errors / self._total_ops,
+                "error_types": dict(self._error_types),
+                "recent_errors": list(islice(self.errors, max(len(self.errors) - 5, 0), None))  # Last 5 errors
             }
 
-        total_operations = len(self.metrics)
-        error_rate = len(self.errors) / total_operations if total_operations > 0 else 0
+    def get_system_info(self, refresh: bool = False) -> SystemInfo:
+        """Get system information (collected on first call, or again with refresh=True)."""
+        if self._system_info is not None and not refresh:
+            return self._system_info
 
-        # Group errors by type
-        error_types = {}
-        for error in self.errors:
-            error_type = error.get("error", "Unknown").split(":")[0]
-            error_types[error_type] = error_types.get(error_type, 0) + 1
+        # Only needed for diagnostics, so imported on first use
+        import platform
+        import psutil
 
-        return {
-            "total_errors": len(self.errors),
-            "error_rate": error_rate,
-            "error_types": error_types,
-            "recent_errors": self.errors[-5:]  # Last 5 errors
-        }
-
-    def get_system_info(self) -> SystemInfo:
-        """Get system information."""
         memory = psutil.virtual_memory()
         disk = psutil.disk_usage('/')
 
-        return SystemInfo(
+        self._system_info = SystemInfo(
             platform=f"{platform.system()} {platform.release()}",
             python_version=platform.python_version(),
             cpu_count=psutil.cpu_count(),
@@ -149,33 +281,25 @@ class InstrumentationManager:
             memory_available=".1f",
             disk_usage=".1f"
         )
+        return self._system_info
 
     def get_performance_summary(self) -> Dict[str, Any]:
         """Get performance summary statistics."""
-        if not self.metrics:
-            return {"total_operations": 0, "avg_duration": 0.0, "success_rate": 0.0}
-
-        total_ops = len(self.metrics)
-        successful_ops = sum(1 for m in self.metrics if m.success)
-        avg_duration = sum(m.duration for m in self.metrics) / total_ops
-
-        # Group by operation type
-        op_stats = {}
-        for metric in self.metrics:
-            if metric.operation not in op_stats:
-                op_stats[metric.operation] = {"count": 0, "total_duration": 0.0, "errors": 0}
-            op_stats[metric.operation]["count"] += 1
-            op_stats[metric.operation]["total_duration"] += metric.duration
-            if not metric.success:
-                op_stats[metric.operation]["errors"] += 1
-
-        return {
-            "total_operations": total_ops,
-            "success_rate": successful_ops / total_ops,
-            "avg_duration": avg_duration,
-            "operation_stats": op_stats,
-            "uptime": time.time() - self.start_time
-        }
+        with self._lock:
+            total_ops = self._total_ops
+            if not total_ops:
+                return {"total_operations": 0, "avg_duration": 0.0, "success_rate": 0.0}
+
+            return {
+                "total_operations": total_ops,
+                "success_rate": self._successful_ops / total_ops,
+                "avg_duration": self._duration_sum_ns / total_ops / _NS_PER_S,
+                "operation_stats": {
+                    op: {"count": count, "total_duration": total_ns / _NS_PER_S, "errors": errors}
+                    for op, (count, total_ns, errors) in self._op_stats.items()
+                },
+                "uptime": time.time() - self.start_time
+            }
 
 # Global instrumentation instance
 instrumentation = InstrumentationManager()
@@ -185,10 +309,12 @@ def log_chat_request(provider: str, model: str, message_count: int, streaming: b
     instrumentation.log_operation(
         "chat_request",
         True,
-        provider=provider,
-        model=model,
-        message_count=message_count,
-        streaming=streaming
+        metadata={
+            "provider": provider,
+            "model": model,
+            "message_count": message_count,
+            "streaming": streaming,
+        }
     )
 
 def log_chat_response(provider: str, model: str, success: bool, response_length: int = 0,
@@ -199,10 +325,12 @@ def log_chat_response(provider: str, model: str, success: bool, response_length:
         success,
         duration,
         error,
-        provider=provider,
-        model=model,
-        response_length=response_length,
-        tokens_used=tokens_used
+        metadata={
+            "provider": provider,
+            "model": model,
+            "response_length": response_length,
+            "tokens_used": tokens_used,
+        }
     )
 
 def log_provider_health_check(provider: str, success: bool, duration: float, error: Exception = None):
@@ -212,7 +340,7 @@ def log_provider_health_check(provider: str, success: bool, duration: float, err
         success,
         duration,
         error,
-        provider=provider
+        metadata={"provider": provider}
     )
 
 def create_debug_panel():
@@ -309,14 +437,23 @@ def create_debug_panel():
             else:
                 st.info("No operations logged yet.")
 
+def _json_default(obj):
+    """json.dumps fallback for dataclasses and other non-JSON values."""
+    if is_dataclass(obj):
+        return asdict(obj)
+    return str(obj)
+
+
 def export_diagnostics():
     """Export diagnostics data for support."""
     diagnostics = {
         "timestamp": datetime.now().isoformat(),
         "performance": instrumentation.get_performance_summary(),
         "errors": instrumentation.get_error_summary(),
-        "system": asdict(instrumentation.get_system_info()),
-        "recent_metrics": [asdict(m) for m in instrumentation.get_recent_metrics(100)]
+        "system": instrumentation.get_system_info(),
+        "recent_metrics": instrumentation.get_recent_metrics(100)
     }
 
-    return json.dumps(diagnostics, indent=2, default=str)
\ No newline at end of file
+    if orjson is not None:
+        return orjson.dumps(diagnostics, default=str, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(diagnostics, indent=2, default=_json_default)
\ No newline at end of file
@@ -5,24 +5,42 @@ Handles token limits, context window management, and intelligent message summari
 from __future__ import annotations
 import re
 import json
+import threading
+import time
+from bisect import bisect_right
+from itertools import accumulate
 from typing import List, Dict, Any, Optional, Tuple, Protocol
-from dataclasses import dataclass
-from datetime import datetime
+from dataclasses import dataclass, field
 from enum import Enum
 import tiktoken
 
 from instrumentation import instrumentation
 
+# Words/phrases that mark a user message as a question in MessageSummarizer
+_QUESTION_WORDS = frozenset(("what", "how", "why", "when", "where"))
+_QUESTION_PHRASES = ("can you", "tell me")
+_WORD_RE = re.compile(r'\b\w+\b')
+_SUMMARY_PREFIX = "Summary of earlier conversation: "
+_TOPICS_PREFIX = "Topics discussed: "
+_LIST_SEPARATOR = ", "
 
-class ContextStrategy(Enum):
+# Token encoders shared by every ContextManager (BPE tables are large and
+# tiktoken encoders are safe to use from multiple threads)
+_ENCODER_CACHE: Dict[str, tiktoken.Encoding] = {}
+_ENCODER_LOCK = threading.Lock()
+
+
+class ContextStrategy(str, Enum):
     """Strategies for managing conversation context."""
+    # The str mixin gives members C-level hashing and equality, so the strategy
+    # dispatch-table lookups avoid Enum.__hash__ while .value stays a string
     TRUNCATE_OLDEST = "truncate_oldest"  # Remove oldest messages
     SUMMARIZE_OLDEST = "summarize_oldest"  # Summarize old messages
     KEEP_RECENT = "keep_recent"  # Keep only recent messages
     SLIDING_WINDOW = "sliding_window"  # Use sliding window approach
 
 
-@dataclass
+@dataclass(slots=True)
 class TokenUsage:
     """Token usage statistics for a conversation."""
     total_tokens: int
@@ -31,19 +49,16 @@ class TokenUsage:
     remaining_tokens: int
     max_tokens: int
     utilization_percent: float
+    # Limit checks, computed once at construction
+    is_near_limit: bool = field(init=False, repr=False, compare=False)  # approaching the token limit
+    is_over_limit: bool = field(init=False, repr=False, compare=False)  # over the token limit
 
-    @property
-    def is_near_limit(self) -> bool:
-        """Check if we're approaching the token limit."""
-        return self.utilization_percent > 80.0
-
-    @property
-    def is_over_limit(self) -> bool:
-        """Check if we're over the token limit."""
-        return self.total_tokens > self.max_tokens
+    def __post_init__(self):
+        self.is_near_limit = self.utilization_percent > 80.0
+        self.is_over_limit = self.total_tokens > self.max_tokens
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MemoryConfig:
     """Configuration for memory management."""
     max_context_tokens: int = 4000  # Conservative default
@@ -74,33 +89,42 @@ class MessageSummarizer:
         user_questions = []
         assistant_responses = []
         topics = set()
+        max_question_chars = 100
+        max_response_chars = 150
 
         for msg in messages:
-            content = msg.get("content", "").lower()
+            raw = msg.get("content", "")
+            role = msg["role"]
+
+            if role == "user":
+                content = raw.lower()
+                words = _WORD_RE.findall(content)
 
-            if msg["role"] == "user":
                 # Extract potential questions or topics
-                if any(word in content for word in ["what", "how", "why", "when", "where", "can you", "tell me"]):
-                    user_questions.append(msg["content"][:100] + "..." if len(msg["content"]) > 100 else msg["content"])
+                if not _QUESTION_WORDS.isdisjoint(words) or any(p in content for p in _QUESTION_PHRASES):
+                    user_questions.append(
+                        raw[:max_question_chars] + "..." if len(raw) > max_question_chars else raw
+                    )
                 else:
                     user_questions.append("User input")
 
                 # Extract topics (simple keyword extraction)
-                words = re.findall(r'\b\w+\b', content)
                 topics.update(word for word in words if len(word) > 4)
 
-            elif msg["role"] == "assistant":
-                assistant_responses.append(msg["content"][:150] + "..." if len(msg["content"]) > 150 else msg["content"])
+            elif role == "assistant":
+                assistant_responses.append(
+                    raw[:max_response_chars] + "..." if len(raw) > max_response_chars else raw
+                )
 
         # Create summary
         summary_parts = []
 
         if user_questions:
-            summary_parts.append(f"Previous discussion covered {len(user_questions)} user questions including: {', '.join(user_questions[:3])}")
+            summary_parts.append(f"Previous discussion covered {len(user_questions)} user questions including: {_LIST_SEPARATOR.join(user_questions[:3])}")
 
         if topics:
             top_topics = list(topics)[:5]
-            summary_parts.append(f"Topics discussed: {', '.join(top_topics)}")
+            summary_parts.append(_TOPICS_PREFIX + _LIST_SEPARATOR.join(top_topics))
 
         if assistant_responses:
             summary_parts.append(f"Assistant provided {len(assistant_responses)} responses with guidance and information.")
@@ -112,7 +136,7 @@ class MessageSummarizer:
         if len(summary) > max_chars:
             summary = summary[:max_chars-3] + "..."
 
-        return f"Summary of earlier conversation: {summary}"
+        return _SUMMARY_PREFIX + summary
 
     def should_summarize(self, token_usage: TokenUsage) -> bool:
         """Determine if summarization should be triggered."""
@@ -123,47 +147,103 @@ class MessageSummarizer:
 class ContextManager:
     """Manages conversation context and memory."""
 
+    # Maximum number of cached per-message token counts
+    TOKEN_CACHE_SIZE = 4096
+
     def __init__(self, config: MemoryConfig = None):
         self.config = config or MemoryConfig()
         self.summarizer = MessageSummarizer(self.config)
-        self._encoder_cache = {}
+        # (model, role, content) -> token count for one message
+        self._token_cache: Dict[Tuple[str, str, str], int] = {}
+        # The module-level context_manager is shared by every Streamlit script thread
+        self._token_cache_lock = threading.Lock()
+        # Strategy dispatch tables for optimize_context and manage_context
+        self._dispatch = {
+            ContextStrategy.TRUNCATE_OLDEST: self._truncate_oldest,
+            ContextStrategy.SUMMARIZE_OLDEST: self._summarize_oldest,
+            ContextStrategy.KEEP_RECENT: self._keep_recent,
+            ContextStrategy.SLIDING_WINDOW: self._sliding_window,
+        }
+        self._manage_dispatch = {
+            ContextStrategy.TRUNCATE_OLDEST: self._manage_truncate_oldest,
+            ContextStrategy.SUMMARIZE_OLDEST: self._manage_summarize_oldest,
+            ContextStrategy.KEEP_RECENT: self._manage_keep_recent,
+            # Sliding window keeps recent messages within the token limit
+            ContextStrategy.SLIDING_WINDOW: self._manage_truncate_oldest,
+        }
 
     def get_token_encoder(self, model: str) -> tiktoken.Encoding:
         """Get the appropriate token encoder for a model."""
-        if model not in self._encoder_cache:
-            try:
-                # Try to get the appropriate encoder
-                if "gpt-4" in model:
-                    self._encoder_cache[model] = tiktoken.encoding_for_model("gpt-4")
-                elif "gpt-3.5" in model:
-                    self._encoder_cache[model] = tiktoken.encoding_for_model("gpt-3.5-turbo")
-                else:
-                    # Fallback to cl100k_base (used by GPT-3.5 and GPT-4)
-                    self._encoder_cache[model] = tiktoken.get_encoding("cl100k_base")
-            except Exception:
-                # Ultimate fallback
-                self._encoder_cache[model] = tiktoken.get_encoding("cl100k_base")
-
-        return self._encoder_cache[model]
+        encoder = _ENCODER_CACHE.get(model)
+        if encoder is not None:
+            return encoder
+
+        with _ENCODER_LOCK:
+            if model not in _ENCODER_CACHE:
+                try:
+                    # Try to get the appropriate encoder
+                    if "gpt-4" in model:
+                        _ENCODER_CACHE[model] = tiktoken.encoding_for_model("gpt-4")
+                    elif "gpt-3.5" in model:
+                        _ENCODER_CACHE[model] = tiktoken.encoding_for_model("gpt-3.5-turbo")
+                    else:
+                        # Fallback to cl100k_base (used by GPT-3.5 and GPT-4)
+                        _ENCODER_CACHE[model] = tiktoken.get_encoding("cl100k_base")
+                except Exception:
+                    # Ultimate fallback
+                    _ENCODER_CACHE[model] = tiktoken.get_encoding("cl100k_base")
+
+            return _ENCODER_CACHE[model]
 
     def count_tokens(self, text: str, model: str) -> int:
         """Count tokens in a text string."""
         encoder = self.get_token_encoder(model)
-        return len(encoder.encode(text))
+        # Message text is plain content, so skip tiktoken's special-token scan
+        return len(encoder.encode_ordinary(text))
 
     def calculate_token_usage(self, system_prompt: str, messages: List[Dict[str, str]],
                             model: str) -> TokenUsage:
         """Calculate token usage for a conversation."""
         system_tokens = self.count_tokens(system_prompt, model) if system_prompt else 0
-
-        conversation_tokens = 0
-        for msg in messages:
-            # Add tokens for role and content
-            role_tokens = self.count_tokens(msg["role"], model)
-            content_tokens = self.count_tokens(msg["content"], model)
-            # Rough estimate for message formatting overhead
-            conversation_tokens += role_tokens + content_tokens + 4  # 4 tokens for formatting
-
+        return self._usage_from_counts(system_tokens, self._message_tokens(messages, model))
+
+    def _message_tokens(self, messages: List[Dict[str, str]], model: str) -> List[int]:
+        """Count tokens for each message (role + content + formatting overhead)."""
+        cache = self._token_cache
+        keys = [(model, msg["role"], msg["content"]) for msg in messages]
+        # Only encode messages not counted before; chat histories are re-counted every turn
+        counts = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            count = cache.get(key)
+            if count is None:
+                missing.append(key)
+            else:
+                counts[key] = count
+        if missing:
+            encoder = self.get_token_encoder(model)
+            content_tokens = encoder.encode_ordinary_batch([key[2] for key in missing])
+            # 4 tokens per message is a rough estimate for message formatting overhead
+            new_counts = {
+                key: self.count_tokens(key[1], model) + len(tokens) + 4
+                for key, tokens in zip(missing, content_tokens)
+            }
+            counts.update(new_counts)
+            with self._token_cache_lock:
+                if len(cache) + len(new_counts) > self.TOKEN_CACHE_SIZE:
+                    cache.clear()
+                cache.update(new_counts)
+        # Read from the local counts: the cache may have been cleared above
+        return [counts[key] for key in keys]
+
+    def clear_cache(self) -> None:
+        """Forget all cached per-message token counts."""
+        with self._token_cache_lock:
+            self._token_cache.clear()
+
+    def _usage_from_counts(self, system_tokens: int, message_tokens: List[int]) -> TokenUsage:
+        """Build TokenUsage from already-counted system and per-message tokens."""
+        conversation_tokens = sum(message_tokens)
         total_tokens = system_tokens + conversation_tokens
         max_tokens = self.config.max_context_tokens
         remaining_tokens = max(max_tokens - total_tokens, 0)
@@ -184,10 +264,13 @@ class ContextManager:
         Optimize conversation context based on the configured strategy.
         Returns (optimized_system_prompt, optimized_messages)
         """
-        start_time = datetime.now()
+        start_time = time.perf_counter()
 
         try:
-            token_usage = self.calculate_token_usage(system_prompt, messages, model)
+            # Count tokens once; the strategies below reuse these counts
+            system_tokens = self.count_tokens(system_prompt, model) if system_prompt else 0
+            message_tokens = self._message_tokens(messages, model)
+            token_usage = self._usage_from_counts(system_tokens, message_tokens)
 
             # If we're under the limit, no optimization needed
             if not token_usage.is_near_limit:
@@ -195,23 +278,13 @@ class ContextManager:
                                             strategy="none", original_tokens=token_usage.total_tokens)
                 return system_prompt, messages
 
-            # Apply the configured optimization strategy
-            if self.config.strategy == ContextStrategy.TRUNCATE_OLDEST:
-                optimized_system, optimized_messages = self._truncate_oldest(system_prompt, messages, model)
-            elif self.config.strategy == ContextStrategy.SUMMARIZE_OLDEST:
-                optimized_system, optimized_messages = self._summarize_oldest(system_prompt, messages, model)
-            elif self.config.strategy == ContextStrategy.KEEP_RECENT:
-                optimized_system, optimized_messages = self._keep_recent(system_prompt, messages, model)
-            elif self.config.strategy == ContextStrategy.SLIDING_WINDOW:
-                optimized_system, optimized_messages = self._sliding_window(system_prompt, messages, model)
-            else:
-                # Default to sliding window
-                optimized_system, optimized_messages = self._sliding_window(system_prompt, messages, model)
+            # Apply the configured optimization strategy (default to sliding window)
+            strategy_fn = self._dispatch.get(self.config.strategy, self._sliding_window)
+            optimized_system, optimized_messages, new_token_usage, _ = strategy_fn(
+                system_prompt, messages, model, token_usage, message_tokens
+            )
 
-            # Calculate new token usage
-            new_token_usage = self.calculate_token_usage(optimized_system, optimized_messages, model)
-
-            duration = (datetime.now() - start_time).total_seconds()
+            duration = time.perf_counter() - start_time
             instrumentation.log_operation("context_optimization", True, duration,
                                         strategy=self.config.strategy.value,
                                         original_tokens=token_usage.total_tokens,
@@ -221,43 +294,46 @@ class ContextManager:
             return optimized_system, optimized_messages
 
         except Exception as e:
-            duration = (datetime.now() - start_time).total_seconds()
+            duration = time.perf_counter() - start_time
             instrumentation.log_operation("context_optimization", False, duration, e,
                                         strategy=self.config.strategy.value)
             # Return original context on error
             return system_prompt, messages
 
-    def _truncate_oldest(self, system_prompt: str, messages: List[Dict[str, str]],
-                        model: str) -> Tuple[str, List[Dict[str, str]]]:
+    # The strategy helpers below take the TokenUsage and per-message token counts
+    # for `messages` and return (system_prompt, messages, token_usage, message_tokens)
+    # for the optimized result, so no strategy has to re-tokenize the history.
+
+    def _truncate_oldest(self, system_prompt: str, messages: List[Dict[str, str]], model: str,
+                        token_usage: TokenUsage, message_tokens: List[int]
+                        ) -> Tuple[str, List[Dict[str, str]], TokenUsage, List[int]]:
         """Truncate oldest messages to fit within token limit."""
         if len(messages) <= self.config.min_messages_to_keep:
-            return system_prompt, messages
+            return system_prompt, messages, token_usage, message_tokens
 
         # Keep removing oldest messages until we're under the limit
         optimized_messages = messages.copy()
 
         while len(optimized_messages) > self.config.min_messages_to_keep:
-            token_usage = self.calculate_token_usage(system_prompt, optimized_messages, model)
             if not token_usage.is_over_limit:
                 break
             # Remove the oldest non-system message pair (question + answer)
-            if len(optimized_messages) >= 2:
-                optimized_messages = optimized_messages[2:]
-            else:
-                optimized_messages = optimized_messages[1:]
+            drop = 2 if len(optimized_messages) >= 2 else 1
+            optimized_messages = optimized_messages[drop:]
+            message_tokens = message_tokens[drop:]
+            token_usage = self._usage_from_counts(token_usage.system_tokens, message_tokens)
 
-        return system_prompt, optimized_messages
+        return system_prompt, optimized_messages, token_usage, message_tokens
 
-    def _summarize_oldest(self, system_prompt: str, messages: List[Dict[str, str]],
-                         model: str) -> Tuple[str, List[Dict[str, str]]]:
+    def _summarize_oldest(self, system_prompt: str, messages: List[Dict[str, str]], model: str,
+                         token_usage: TokenUsage, message_tokens: List[int]
+                         ) -> Tuple[str, List[Dict[str, str]], TokenUsage, List[int]]:
         """Summarize oldest messages and replace them with a summary."""
         if len(messages) <= self.config.min_messages_to_keep:
-            return system_prompt, messages
-
-        token_usage = self.calculate_token_usage(system_prompt, messages, model)
+            return system_prompt, messages, token_usage, message_tokens
 
         if not self.summarizer.should_summarize(token_usage):
-            return system_prompt, messages
+            return system_prompt, messages, token_usage, message_tokens
 
         # Find how many messages to summarize
         # Keep at least min_messages_to_keep recent messages
@@ -265,7 +341,7 @@ class ContextManager:
         messages_to_summarize = messages[:-messages_to_keep]
 
         if not messages_to_summarize:
-            return system_prompt, messages
+            return system_prompt, messages, token_usage, message_tokens
 
         # Create summary
         summary_text = self.summarizer.summarize_messages(messages_to_summarize)
@@ -278,41 +354,47 @@ class ContextManager:
 
         # Combine summary with recent messages
         optimized_messages = [summary_message] + messages[-messages_to_keep:]
+        message_tokens = self._message_tokens([summary_message], model) + message_tokens[-messages_to_keep:]
+        token_usage = self._usage_from_counts(token_usage.system_tokens, message_tokens)
 
-        return system_prompt, optimized_messages
+        return system_prompt, optimized_messages, token_usage, message_tokens
 
-    def _keep_recent(self, system_prompt: str, messages: List[Dict[str, str]],
-                    model: str) -> Tuple[str, List[Dict[str, str]]]:
+    def _keep_recent(self, system_prompt: str, messages: List[Dict[str, str]], model: str,
+                    token_usage: TokenUsage, message_tokens: List[int]
+                    ) -> Tuple[str, List[Dict[str, str]], TokenUsage, List[int]]:
         """Keep only the most recent messages."""
         # Calculate how many recent messages we can keep
         max_messages = self.config.min_messages_to_keep
 
         # Estimate tokens for recent messages
-        recent_messages = messages[-max_messages:] if len(messages) > max_messages else messages
-
-        token_usage = self.calculate_token_usage(system_prompt, recent_messages, model)
+        if len(messages) > max_messages:
+            recent_messages = messages[-max_messages:]
+            message_tokens = message_tokens[-max_messages:]
+            token_usage = self._usage_from_counts(token_usage.system_tokens, message_tokens)
+        else:
+            recent_messages = messages
 
         # If still over limit, reduce further
         while len(recent_messages) > 1 and token_usage.is_over_limit:
             recent_messages = recent_messages[1:]
-            token_usage = self.calculate_token_usage(system_prompt, recent_messages, model)
+            message_tokens = message_tokens[1:]
+            token_usage = self._usage_from_counts(token_usage.system_tokens, message_tokens)
 
-        return system_prompt, recent_messages
+        return system_prompt, recent_messages, token_usage, message_tokens
 
-    def _sliding_window(self, system_prompt: str, messages: List[Dict[str, str]],
-                       model: str) -> Tuple[str, List[Dict[str, str]]]:
+    def _sliding_window(self, system_prompt: str, messages: List[Dict[str, str]], model: str,
+                       token_usage: TokenUsage, message_tokens: List[int]
+                       ) -> Tuple[str, List[Dict[str, str]], TokenUsage, List[int]]:
         """Use a sliding window approach - keep recent messages, summarize if needed."""
         # First try to keep recent messages
-        optimized_system, optimized_messages = self._keep_recent(system_prompt, messages, model)
+        recent = self._keep_recent(system_prompt, messages, model, token_usage, message_tokens)
+        recent_messages, recent_usage = recent[1], recent[2]
 
         # If still over limit after keeping recent, try summarization
-        token_usage = self.calculate_token_usage(optimized_system, optimized_messages, model)
+        if recent_usage.is_over_limit and len(messages) > len(recent_messages):
+            return self._summarize_oldest(system_prompt, messages, model, token_usage, message_tokens)
 
-        if token_usage.is_over_limit and len(messages) > len(optimized_messages):
-            # Try summarization approach
-            return self._summarize_oldest(system_prompt, messages, model)
-
-        return optimized_system, optimized_messages
+        return recent
 
     def get_memory_stats(self, system_prompt: str, messages: List[Dict[str, str]],
                         model: str) -> Dict[str, Any]:
@@ -342,13 +424,7 @@ class ContextManager:
 
     def estimate_tokens(self, messages: List[Dict[str, str]], model: str = "gpt-3.5-turbo") -> int:
         """Estimate total tokens in messages (convenience method)."""
-        total_tokens = 0
-        for msg in messages:
-            # Rough estimation: ~4 tokens per message overhead + content tokens
-            total_tokens += self.count_tokens(msg["role"], model)
-            total_tokens += self.count_tokens(msg["content"], model)
-            total_tokens += 4  # Message formatting overhead
-        return total_tokens
+        return sum(self._message_tokens(messages, model))
 
     def manage_context(self, messages: List[Dict[str, str]], config: MemoryConfig,
                       strategy: ContextStrategy, provider: str) -> List[Dict[str, str]]:
@@ -356,51 +432,38 @@ class ContextManager:
         Manage conversation context based on strategy.
         This is a simplified interface that doesn't modify system prompts.
         """
-        # For now, use a simple token-based approach
-        current_tokens = self.estimate_tokens(messages, "gpt-3.5-turbo")  # Default model for estimation
+        # Count each message once; strategies reuse the counts instead of re-encoding
+        message_tokens = self._message_tokens(messages, "gpt-3.5-turbo")  # Default model for estimation
 
-        if current_tokens <= config.max_context_tokens:
+        if sum(message_tokens) <= config.max_context_tokens:
             return messages  # No changes needed
 
-        # Apply strategy
-        if strategy == ContextStrategy.TRUNCATE_OLDEST:
-            # Keep only the most recent messages that fit
-            optimized_messages = []
-            total_tokens = 0
-            max_tokens = config.max_context_tokens
-
-            # Always keep the last message (current user input)
-            for msg in reversed(messages):
-                msg_tokens = self.count_tokens(msg["role"], "gpt-3.5-turbo") + \
-                           self.count_tokens(msg["content"], "gpt-3.5-turbo") + 4
-
-                if total_tokens + msg_tokens <= max_tokens:
-                    optimized_messages.insert(0, msg)
-                    total_tokens += msg_tokens
-                else:
-                    break
-
-            return optimized_messages
-
-        elif strategy == ContextStrategy.SUMMARIZE_OLDEST:
-            # For now, just truncate but keep more recent messages
-            keep_ratio = 0.7  # Keep 70% of messages by recency
-            keep_count = max(2, int(len(messages) * keep_ratio))
-            return messages[-keep_count:] if len(messages) > keep_count else messages
-
-        elif strategy == ContextStrategy.KEEP_RECENT:
-            # Keep only recent messages
-            keep_count = max(2, min(len(messages), 10))  # Keep last 10 messages or all if fewer
-            return messages[-keep_count:] if len(messages) > keep_count else messages
-
-        elif strategy == ContextStrategy.SLIDING_WINDOW:
-            # Use sliding window - keep recent messages within token limit
-            return self.manage_context(messages, config, ContextStrategy.TRUNCATE_OLDEST, provider)
-
-        else:
-            # Default: truncate oldest
-            return self.manage_context(messages, config, ContextStrategy.TRUNCATE_OLDEST, provider)
-
-
-# Global context manager instance
+        # Apply strategy (default: truncate oldest)
+        strategy_fn = self._manage_dispatch.get(strategy, self._manage_truncate_oldest)
+        return strategy_fn(messages, config, message_tokens)
+
+    def _manage_truncate_oldest(self, messages: List[Dict[str, str]], config: MemoryConfig,
+                                message_tokens: List[int]) -> List[Dict[str, str]]:
+        """Keep only the most recent messages that fit within the token limit."""
+        # Running totals from the newest message backwards are strictly increasing,
+        # so the number of messages that fit is a binary search away
+        totals = list(accumulate(reversed(message_tokens)))
+        keep_count = bisect_right(totals, config.max_context_tokens)
+        return messages[len(messages) - keep_count:]
+
+    def _manage_summarize_oldest(self, messages: List[Dict[str, str]], config: MemoryConfig,
+                                 message_tokens: List[int]) -> List[Dict[str, str]]:
+        """For now, just truncate but keep more recent messages."""
+        keep_ratio = 0.7  # Keep 70% of messages by recency
+        keep_count = max(2, int(len(messages) * keep_ratio))
+        return messages[-keep_count:] if len(messages) > keep_count else messages
+
+    def _manage_keep_recent(self, messages: List[Dict[str, str]], config: MemoryConfig,
+                            message_tokens: List[int]) -> List[Dict[str, str]]:
+        """Keep only recent messages."""
+        keep_count = max(2, min(len(messages), 10))  # Keep last 10 messages or all if fewer
+        return messages[-keep_count:] if len(messages) > keep_count else messages
+
+
+# Global context manager instance; prefer it over creating new ContextManagers
 context_manager = ContextManager()
\ No newline at end of file
@@ -3,18 +3,118 @@ Model provider abstraction for multiple AI services.
 """
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Generator
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Generator, AsyncGenerator, Tuple, Callable
+import asyncio
+import functools
+import hashlib
+import importlib
 import os
+import threading
+
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+
+def _response_cache_key(
+    model: str,
+    system_prompt: str,
+    messages: List[Dict[str, str]],
+    args: Tuple[Any, ...] = (),
+    kwargs: Optional[Dict[str, Any]] = None,
+) -> bytes:
+    """Hash a chat request, including its extra arguments, into a compact response-cache key."""
+    body = _json.dumps(
+        {"m": model, "s": system_prompt, "msgs": messages, "a": args, "kw": sorted((kwargs or {}).items())},
+        default=str,
+    )
+    if isinstance(body, str):
+        body = body.encode()
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+
+def cached_response(chat: Callable[..., str]) -> Callable[..., str]:
+    """
+    Decorator for ModelProvider.chat adding an opt-in exact-match response cache.
+    Pass cache=True to reuse the reply for an identical request: same model,
+    system_prompt, messages and extra arguments (max_tokens, temperature, ...).
+    """
+    @functools.wraps(chat)
+    def wrapper(self, model, system_prompt, messages, *args, cache: bool = False, **kwargs):
+        if not cache:
+            return chat(self, model, system_prompt, messages, *args, **kwargs)
+
+        key = _response_cache_key(model, system_prompt, messages, args, kwargs)
+        responses = self._response_cache
+        result = responses.get(key)
+        if result is not None:
+            responses.move_to_end(key)
+            return result
+
+        result = chat(self, model, system_prompt, messages, *args, **kwargs)
+        responses[key] = result
+        if len(responses) > self.response_cache_size:
+            responses.popitem(last=False)
+        return result
+    return wrapper
 
-# Import providers to register them
-from . import providers
+
+def rejects_response_cache(chat_async: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Decorator for native chat_async overrides, which do not go through chat()
+    and so have no response cache; cache=True raises instead of being ignored.
+    """
+    @functools.wraps(chat_async)
+    async def wrapper(self, model, system_prompt, messages, *args, cache: bool = False, **kwargs):
+        if cache:
+            raise TypeError(f"{type(self).__name__}.chat_async does not support cache=True; use chat()")
+        return await chat_async(self, model, system_prompt, messages, *args, **kwargs)
+    return wrapper
 
 
 class ModelProvider(ABC):
     """Abstract base class for AI model providers."""
 
+    # Max entries in the per-instance response cache used by chat(..., cache=True)
+    response_cache_size: int = 256
+
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or self._get_api_key()
+        # request hash -> reply, least recently used first
+        self._response_cache: "OrderedDict[bytes, str]" = OrderedDict()
+        # (system prompt, messages included so far, [system] + messages) from the previous call
+        self._sys_msg_cache: Optional[Tuple[str, List[Dict[str, str]], List[Dict[str, str]]]] = None
+        self._sys_msg_lock = threading.Lock()
+
+    def clear_response_cache(self) -> None:
+        """Drop all cached chat replies."""
+        self._response_cache.clear()
+
+    def _with_system_message(self, system_prompt: str, messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """
+        Build [system message] + messages for chat-completions style APIs.
+        For longer histories the previous list is extended when the system
+        prompt is unchanged and messages only grew since the last call; callers
+        get a copy, so the cached list is never shared.
+        """
+        if len(messages) <= 8:
+            return [{"role": "system", "content": system_prompt}] + messages
+
+        with self._sys_msg_lock:
+            cached = self._sys_msg_cache
+            if cached is not None and cached[0] == system_prompt and len(cached[1]) <= len(messages) and all(
+                old is new for old, new in zip(cached[1], messages)
+            ):
+                _, source, full = cached
+            else:
+                source, full = [], [{"role": "system", "content": system_prompt}]
+            tail = messages[len(source):]
+            source.extend(tail)
+            full.extend(tail)
+            self._sys_msg_cache = (system_prompt, source, full)
+            return list(full)
 
     @property
     @abstractmethod
@@ -60,25 +160,66 @@ class ModelProvider(ABC):
         """Check if the provider is accessible."""
         pass
 
+    async def chat_async(
+        self,
+        model: str,
+        system_prompt: str,
+        messages: List[Dict[str, str]],
+        **kwargs
+    ) -> str:
+        """Async chat completion (runs chat() in a worker thread unless overridden).
+
+        The thread fallback honours chat()'s cache=True; native overrides reject it.
+        """
+        return await asyncio.to_thread(self.chat, model, system_prompt, messages, **kwargs)
+
+    async def chat_stream_async(
+        self,
+        model: str,
+        system_prompt: str,
+        messages: List[Dict[str, str]],
+        **kwargs
+    ) -> AsyncGenerator[str, None]:
+        """Async streaming chat completion (yields the full reply unless overridden)."""
+        yield await self.chat_async(model, system_prompt, messages, **kwargs)
+
 
 class ModelProviderRegistry:
     """Registry for managing model providers."""
 
     def __init__(self):
-        self._provider_classes: Dict[str, type] = {}
+        # Values are provider classes, or "module:Class" paths not yet imported
+        self._provider_classes: Dict[str, Any] = {}
         self._provider_instances: Dict[str, ModelProvider] = {}
+        # model name -> provider name, filled in as providers are scanned
+        self._model_to_provider: Dict[str, str] = {}
 
     def register(self, provider_class: type) -> None:
         """Register a model provider class."""
         # Get the name from the class without instantiating
         name = getattr(provider_class, 'provider_name', provider_class.__name__.replace('Provider', ''))
         self._provider_classes[name] = provider_class
+        self._model_to_provider.clear()
+
+    def register_lazy(self, name: str, target: str) -> None:
+        """Register a provider by "module:Class" path; the module is imported on first use."""
+        self._provider_classes[name] = target
+        self._model_to_provider.clear()
+
+    def _resolve_class(self, name: str) -> type:
+        """Get the provider class for name, importing it if it was registered lazily."""
+        provider_class = self._provider_classes[name]
+        if isinstance(provider_class, str):
+            module_name, _, class_name = provider_class.partition(":")
+            provider_class = getattr(importlib.import_module(module_name), class_name)
+            self._provider_classes[name] = provider_class
+        return provider_class
 
     def get_provider(self, name: str) -> Optional[ModelProvider]:
-        """Get a provider instance by name (lazy instantiation)."""
+        """Get a provider instance by name (lazy import and instantiation)."""
         if name not in self._provider_instances:
             if name in self._provider_classes:
-                self._provider_instances[name] = self._provider_classes[name]()
+                self._provider_instances[name] = self._resolve_class(name)()
         return self._provider_instances.get(name)
 
     def get_available_providers(self) -> List[str]:
@@ -87,16 +228,42 @@ class ModelProviderRegistry:
 
     def get_provider_for_model(self, model_name: str) -> Optional[ModelProvider]:
         """Find provider that supports a specific model."""
+        provider_name = self._model_to_provider.get(model_name)
+        if provider_name is not None:
+            return self.get_provider(provider_name)
+
+        # Cache miss: scan providers in registration order (model lists can change at runtime)
         for provider_name in self._provider_classes:
             provider = self.get_provider(provider_name)
-            if provider and model_name in provider.available_models:
+            if not provider:
+                continue
+            models = provider.available_models
+            for name in models:
+                self._model_to_provider.setdefault(name, provider_name)
+            if model_name in models:
                 return provider
         return None
 
 
+async def chat_many_async(
+    targets: List[Tuple[ModelProvider, str]],
+    system_prompt: str,
+    messages: List[Dict[str, str]],
+    **kwargs
+) -> List[Any]:
+    """
+    Send the same conversation to several (provider, model) pairs concurrently.
+    Returns replies in target order; failed calls are returned as their exception.
+    """
+    return await asyncio.gather(
+        *(provider.chat_async(model, system_prompt, messages, **kwargs) for provider, model in targets),
+        return_exceptions=True
+    )
+
+
 # Global registry instance
 registry = ModelProviderRegistry()
 
-# Import providers to register them (after registry is defined)
+# Register providers (after registry is defined; provider modules are imported on first use)
 from . import providers
 providers.setup_providers(registry)
\ No newline at end of file
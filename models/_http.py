@@ -0,0 +1,40 @@
+"""
+Shared async HTTP clients for model providers.
+"""
+from __future__ import annotations
+import asyncio
+import importlib.util
+import weakref
+from typing import Any, Callable
+
+import httpx
+
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+# HTTP/2 lets concurrent requests to one host share a connection; needs the optional h2 package
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+# Async clients are bound to the event loop they were created on, so keep one per loop
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def per_loop(cache: weakref.WeakKeyDictionary, factory: Callable[[], Any]) -> Any:
+    """Get the object cached for the running event loop, creating it with factory()."""
+    loop = asyncio.get_running_loop()
+    obj = cache.get(loop)
+    if obj is None:
+        obj = cache[loop] = factory()
+    return obj
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Get the pooled AsyncClient for the running event loop (HTTP/2 when h2 is installed)."""
+    return per_loop(_ASYNC_CLIENTS, lambda: httpx.AsyncClient(limits=_LIMITS, http2=_HTTP2))
+
+
+async def aclose_async_client() -> None:
+    """Close the pooled AsyncClient for the running event loop."""
+    client = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -3,9 +3,35 @@ Anthropic (Claude) model provider implementation.
 """
 from __future__ import annotations
 from typing import List, Dict, Any, Optional, Generator
+import atexit
+import importlib.util
 import os
-from anthropic import Anthropic
-from . import ModelProvider
+import threading
+from . import ModelProvider, cached_response
+
+
+def iter_text_batched(response, batch_chars: int = 1) -> Generator[str, None, None]:
+    """Yield text deltas from an Anthropic event stream in batches of ~batch_chars."""
+    if batch_chars <= 1:
+        # Every non-empty delta would flush on its own; skip the buffer
+        for chunk in response:
+            if chunk.type == "content_block_delta" and chunk.delta.text:
+                yield chunk.delta.text
+        return
+
+    buf = []
+    buf_len = 0
+    for chunk in response:
+        if chunk.type == "content_block_delta" and chunk.delta.text:
+            text = chunk.delta.text
+            buf.append(text)
+            buf_len += len(text)
+            if buf_len >= batch_chars:
+                yield "".join(buf)
+                buf.clear()
+                buf_len = 0
+    if buf:
+        yield "".join(buf)
 
 
 class AnthropicProvider(ModelProvider):
@@ -13,17 +39,66 @@ class AnthropicProvider(ModelProvider):
     
     provider_name = "Anthropic"
 
+    # One HTTP connection pool shared by every AnthropicProvider instance
+    _shared_http_client = None
+
     def __init__(self, api_key: Optional[str] = None):
         super().__init__(api_key)
         self._client = None
+        # (messages converted so far, their Anthropic form) from the previous call
+        self._fmt_cache = None
+        self._fmt_lock = threading.Lock()
 
     @property
     def client(self):
         """Lazy initialization of Anthropic client."""
         if self._client is None and self.api_key:
-            self._client = Anthropic(api_key=self.api_key)
+            # Import lazily so the SDK is only loaded when this provider is used
+            from anthropic import Anthropic
+            self._client = Anthropic(api_key=self.api_key, http_client=self._get_http_client())
         return self._client
 
+    @classmethod
+    def _get_http_client(cls):
+        """Get the shared keep-alive HTTP client (HTTP/2 when h2 is installed)."""
+        if cls._shared_http_client is None:
+            from anthropic import DefaultHttpxClient
+            http2 = importlib.util.find_spec("h2") is not None
+            cls._shared_http_client = DefaultHttpxClient(http2=http2)
+            atexit.register(cls.shutdown)
+        return cls._shared_http_client
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Close the shared HTTP client."""
+        if cls._shared_http_client is not None:
+            cls._shared_http_client.close()
+            cls._shared_http_client = None
+
+    def _convert_messages(self, messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Convert messages to Anthropic format, reusing the previous conversion.
+
+        Chat histories only grow between turns, so when the previously converted
+        messages are a prefix of this call's (the same message dicts, even in a
+        new list) only the newly appended messages are converted. Callers get
+        a copy, so the cached list is never shared.
+        """
+        with self._fmt_lock:
+            cached = self._fmt_cache
+            if cached is not None and len(cached[0]) <= len(messages) and all(
+                old is new for old, new in zip(cached[0], messages)
+            ):
+                source, converted = cached
+                start = len(converted)
+            else:
+                source, converted = [], []
+                start = 0
+            tail = messages[start:]
+            source.extend(tail)
+            converted.extend([{"role": msg["role"], "content": msg["content"]} for msg in tail])
+            self._fmt_cache = (source, converted)
+            return list(converted)
+
     @property
     def name(self) -> str:
         return "Anthropic"
@@ -41,6 +116,7 @@ class AnthropicProvider(ModelProvider):
     def _get_api_key(self) -> Optional[str]:
         return os.getenv("ANTHROPIC_API_KEY")
 
+    @cached_response
     def chat(
         self,
         model: str,
@@ -51,13 +127,7 @@ class AnthropicProvider(ModelProvider):
     ) -> str:
         """Non-streaming chat completion."""
         try:
-            # Convert messages format for Anthropic
-            anthropic_messages = []
-            for msg in messages:
-                anthropic_messages.append({
-                    "role": msg["role"],
-                    "content": msg["content"]
-                })
+            anthropic_messages = self._convert_messages(messages)
 
             response = self.client.messages.create(
                 model=model,
@@ -76,17 +146,17 @@ class AnthropicProvider(ModelProvider):
         system_prompt: str,
         messages: List[Dict[str, str]],
         max_tokens: int = 4096,
+        batch_chars: int = 1,
         **kwargs
     ) -> Generator[str, None, None]:
-        """Streaming chat completion."""
+        """Streaming chat completion.
+
+        Each text delta is yielded as it arrives. Pass a larger ``batch_chars``
+        to buffer deltas into chunks of at least that many characters (the
+        remainder is flushed at the end).
+        """
         try:
-            # Convert messages format for Anthropic
-            anthropic_messages = []
-            for msg in messages:
-                anthropic_messages.append({
-                    "role": msg["role"],
-                    "content": msg["content"]
-                })
+            anthropic_messages = self._convert_messages(messages)
 
             response = self.client.messages.create(
                 model=model,
@@ -97,9 +167,7 @@ class AnthropicProvider(ModelProvider):
                 **kwargs
             )
 
-            for chunk in response:
-                if chunk.type == "content_block_delta" and chunk.delta.text:
-                    yield chunk.delta.text
+            yield from iter_text_batched(response, batch_chars)
         except Exception as e:
             raise Exception(f"Anthropic API error: {e}")
 
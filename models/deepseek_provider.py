@@ -5,7 +5,7 @@ from __future__ import annotations
 from typing import List, Dict, Any, Optional, Generator
 import os
 from openai import OpenAI
-from . import ModelProvider
+from . import ModelProvider, cached_response
 
 
 class DeepSeekProvider(ModelProvider):
@@ -41,6 +41,7 @@ class DeepSeekProvider(ModelProvider):
     def _get_api_key(self) -> Optional[str]:
         return os.getenv("DEEPSEEK_API_KEY")
 
+    @cached_response
     def chat(
         self,
         model: str,
@@ -82,8 +83,9 @@ class DeepSeekProvider(ModelProvider):
             )
 
             for chunk in response:
-                if chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
+                content = chunk.choices[0].delta.content
+                if content:
+                    yield content
         except Exception as e:
             raise Exception(f"DeepSeek API error: {e}")
 
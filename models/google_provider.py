@@ -2,10 +2,15 @@
 Google (Gemini) model provider implementation.
 """
 from __future__ import annotations
-from typing import List, Dict, Any, Optional, Generator
+from typing import List, Dict, Any, Optional, Generator, AsyncGenerator
+import atexit
+import importlib.util
 import os
-import google.genai as genai
-from . import ModelProvider
+import threading
+from . import ModelProvider, cached_response, rejects_response_cache
+
+# Gemini only knows "user" and "model"; everything that isn't the user maps to "model"
+_ROLE_MAP = {"user": "user"}
 
 
 class GoogleProvider(ModelProvider):
@@ -13,14 +18,51 @@ class GoogleProvider(ModelProvider):
     
     provider_name = "Google"
 
+    # One HTTP connection pool shared by every GoogleProvider instance
+    _shared_http_client = None
+
     def __init__(self, api_key: Optional[str] = None):
         super().__init__(api_key)
         self._client = None
+        # (messages converted so far, their Gemini form) from the previous call
+        self._fmt_cache = None
+        self._fmt_lock = threading.Lock()
+        # (system prompt, its Gemini content entry); the prompt rarely changes within a session
+        self._sys_prefix: Optional[tuple] = None
 
     def _ensure_initialized(self):
         """Lazy initialization of Google client."""
         if self._client is None and self.api_key:
-            self._client = genai.Client(api_key=self.api_key)
+            # Import lazily so the SDK is only loaded when this provider is used
+            import google.genai as genai
+            from google.genai import types
+            # Older google-genai releases have no httpx_client option; they keep their own client
+            if "httpx_client" in types.HttpOptions.model_fields:
+                self._client = genai.Client(
+                    api_key=self.api_key,
+                    http_options=types.HttpOptions(httpx_client=self._get_http_client())
+                )
+            else:
+                self._client = genai.Client(api_key=self.api_key)
+
+    @classmethod
+    def _get_http_client(cls):
+        """Get the shared keep-alive HTTP client (HTTP/2 when h2 is installed)."""
+        if cls._shared_http_client is None:
+            import httpx
+            cls._shared_http_client = httpx.Client(
+                http2=importlib.util.find_spec("h2") is not None,
+                limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+            )
+            atexit.register(cls.shutdown)
+        return cls._shared_http_client
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Close the shared HTTP client."""
+        if cls._shared_http_client is not None:
+            cls._shared_http_client.close()
+            cls._shared_http_client = None
 
     @property
     def client(self):
@@ -28,6 +70,45 @@ class GoogleProvider(ModelProvider):
         self._ensure_initialized()
         return self._client
 
+    def _convert_messages(self, messages: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Convert messages to Gemini format, reusing the previous conversion.
+
+        Chat histories only grow between turns, so when the previously converted
+        messages are a prefix of this call's (the same message dicts, even in a
+        new list) only the newly appended messages are converted. Callers get
+        a copy, so the cached list is never shared.
+        """
+        with self._fmt_lock:
+            cached = self._fmt_cache
+            if cached is not None and len(cached[0]) <= len(messages) and all(
+                old is new for old, new in zip(cached[0], messages)
+            ):
+                source, converted = cached
+                start = len(converted)
+            else:
+                source, converted = [], []
+                start = 0
+            tail = messages[start:]
+            source.extend(tail)
+            converted.extend([
+                {"role": _ROLE_MAP.get(msg["role"], "model"), "parts": [{"text": msg["content"]}]}
+                for msg in tail
+            ])
+            self._fmt_cache = (source, converted)
+            return list(converted)
+
+    def _build_contents(self, system_prompt: str, messages: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Build Gemini contents: system prompt as first user message, then the history."""
+        cached = self._sys_prefix
+        if cached is None or cached[0] != system_prompt:
+            cached = self._sys_prefix = (system_prompt, {
+                "role": "user",
+                "parts": [{"text": "".join(("System: ", system_prompt))}]
+            })
+        contents = [cached[1]]
+        contents.extend(self._convert_messages(messages))
+        return contents
+
     @property
     def name(self) -> str:
         return "Google"
@@ -43,6 +124,7 @@ class GoogleProvider(ModelProvider):
     def _get_api_key(self) -> Optional[str]:
         return os.getenv("GOOGLE_API_KEY")
 
+    @cached_response
     def chat(
         self,
         model: str,
@@ -55,22 +137,7 @@ class GoogleProvider(ModelProvider):
             raise Exception("Google API key not configured")
             
         try:
-            # Convert messages to Gemini format
-            contents = []
-            
-            # Add system prompt as first user message
-            contents.append({
-                "role": "user",
-                "parts": [{"text": f"System: {system_prompt}"}]
-            })
-            
-            # Add conversation history
-            for msg in messages:
-                role = "user" if msg["role"] == "user" else "model"
-                contents.append({
-                    "role": role,
-                    "parts": [{"text": msg["content"]}]
-                })
+            contents = self._build_contents(system_prompt, messages)
 
             response = self.client.models.generate_content(
                 model=model,
@@ -93,22 +160,7 @@ class GoogleProvider(ModelProvider):
             raise Exception("Google API key not configured")
             
         try:
-            # Convert messages to Gemini format
-            contents = []
-            
-            # Add system prompt as first user message
-            contents.append({
-                "role": "user",
-                "parts": [{"text": f"System: {system_prompt}"}]
-            })
-            
-            # Add conversation history
-            for msg in messages:
-                role = "user" if msg["role"] == "user" else "model"
-                contents.append({
-                    "role": role,
-                    "parts": [{"text": msg["content"]}]
-                })
+            contents = self._build_contents(system_prompt, messages)
 
             response = self.client.models.generate_content_stream(
                 model=model,
@@ -121,6 +173,51 @@ class GoogleProvider(ModelProvider):
         except Exception as e:
             raise Exception(f"Google API error: {e}")
 
+    @rejects_response_cache
+    async def chat_async(
+        self,
+        model: str,
+        system_prompt: str,
+        messages: List[Dict[str, str]],
+        **kwargs
+    ) -> str:
+        """Async non-streaming chat completion."""
+        if not self.api_key:
+            raise Exception("Google API key not configured")
+
+        try:
+            response = await self.client.aio.models.generate_content(
+                model=model,
+                contents=self._build_contents(system_prompt, messages)
+            )
+
+            return response.text
+        except Exception as e:
+            raise Exception(f"Google API error: {e}")
+
+    async def chat_stream_async(
+        self,
+        model: str,
+        system_prompt: str,
+        messages: List[Dict[str, str]],
+        **kwargs
+    ) -> AsyncGenerator[str, None]:
+        """Async streaming chat completion."""
+        if not self.api_key:
+            raise Exception("Google API key not configured")
+
+        try:
+            response = await self.client.aio.models.generate_content_stream(
+                model=model,
+                contents=self._build_contents(system_prompt, messages)
+            )
+
+            async for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            raise Exception(f"Google API error: {e}")
+
     def health_check(self) -> bool:
         """Check if Google API is accessible."""
         if not self.api_key:
@@ -2,12 +2,42 @@
 Ollama model provider implementation.
 """
 from __future__ import annotations
-from typing import List, Dict, Any, Optional, Generator
+from typing import List, Dict, Any, Optional, Generator, AsyncGenerator, ClassVar, Tuple
 import os
 import time
 import requests
-from . import ModelProvider
+from requests.adapters import HTTPAdapter
+from . import ModelProvider, cached_response, rejects_response_cache
 from instrumentation import instrumentation
+from ollama._wire import EMPTY, JSON_HEADERS, encode_body, iter_ndjson_lines, loads
+
+# Monotonic clock for operation durations
+_now = time.perf_counter
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if msgspec is not None:
+    class _StreamMessage(msgspec.Struct):
+        content: Optional[str] = None
+
+    class _StreamChunk(msgspec.Struct):
+        message: _StreamMessage = msgspec.field(default_factory=_StreamMessage)
+        done: bool = False
+
+    _decode_stream_chunk = msgspec.json.Decoder(_StreamChunk).decode
+
+    def _parse_stream_line(line) -> Tuple[Optional[str], bool]:
+        """Get (content, done) from one NDJSON stream line, decoding straight into typed structs."""
+        chunk = _decode_stream_chunk(line)
+        return chunk.message.content, chunk.done
+else:
+    def _parse_stream_line(line) -> Tuple[Optional[str], bool]:
+        """Get (content, done) from one NDJSON stream line."""
+        data = loads(line)
+        return data.get("message", EMPTY).get("content"), data.get("done", False)
 
 
 class OllamaProvider(ModelProvider):
@@ -15,15 +45,45 @@ class OllamaProvider(ModelProvider):
     
     provider_name = "Ollama"
 
+    # Keep-alive connection pool shared by all OllamaProvider instances
+    _session: ClassVar[Optional[requests.Session]] = None
+    # base URL -> (fetch time, sorted model names); entries expire after MODELS_CACHE_TTL_S
+    _models_cache: ClassVar[Dict[str, Tuple[float, List[str]]]] = {}
+    MODELS_CACHE_TTL_S: ClassVar[float] = 60.0
+    HEALTH_CACHE_TTL_S: ClassVar[float] = 10.0
+
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        """Get the shared HTTP session, creating it on first use."""
+        if cls._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            cls._session = session
+        return cls._session
+
+    def __init__(self, api_key: Optional[str] = None):
+        super().__init__(api_key)
+        # Read OLLAMA_URL once instead of on every request
+        self._cached_base_url = os.getenv("OLLAMA_URL", "http://localhost:11434").rstrip("/")
+        # (probe time, result) of the last health check; time 0.0 means no valid result
+        self._last_health: Tuple[float, bool] = (0.0, False)
+
     @property
     def name(self) -> str:
         return "Ollama"
 
     @property
     def available_models(self) -> List[str]:
-        """Get available models from Ollama."""
+        """Get available models from Ollama (cached for MODELS_CACHE_TTL_S seconds)."""
+        base_url = self._base_url()
+        cached = self._models_cache.get(base_url)
+        if cached is not None and time.monotonic() - cached[0] < self.MODELS_CACHE_TTL_S:
+            return list(cached[1])
+
         try:
-            response = requests.get(f"{self._base_url()}/api/tags", timeout=5)
+            response = self._get_session().get(f"{base_url}/api/tags", timeout=5)
             response.raise_for_status()
             data = response.json()
             models = [model["name"] for model in data.get("models", [])]
@@ -40,17 +100,24 @@ class OllamaProvider(ModelProvider):
             
             # Add remaining models
             sorted_models.extend(models)
-            return sorted_models
+            self._models_cache[base_url] = (time.monotonic(), sorted_models)
+            return list(sorted_models)
             
         except:
             return ["llama3.2:latest", "llama3.2:3b", "llama3.1:8b", "mistral:latest"]  # Fallback defaults
 
+    def refresh_models(self) -> List[str]:
+        """Drop the cached model list and fetch it again."""
+        self._models_cache.pop(self._base_url(), None)
+        return self.available_models
+
     def _get_api_key(self) -> Optional[str]:
         return None  # Ollama doesn't use API keys
 
     def _base_url(self) -> str:
-        return os.getenv("OLLAMA_URL", "http://localhost:11434").rstrip("/")
+        return self._cached_base_url
 
+    @cached_response
     def chat(
         self,
         model: str,
@@ -60,29 +127,32 @@ class OllamaProvider(ModelProvider):
         **kwargs
     ) -> str:
         """Non-streaming chat completion."""
-        start_time = time.time()
+        start_time = _now()
         try:
             url = f"{self._base_url()}/api/chat"
             payload = {
                 "model": model,
                 "stream": False,
-                "messages": [{"role": "system", "content": system_prompt}] + messages,
+                "messages": self._with_system_message(system_prompt, messages),
             }
 
-            response = requests.post(url, json=payload, timeout=timeout_s)
+            response = self._get_session().post(url, data=encode_body(payload), headers=JSON_HEADERS, timeout=timeout_s)
             response.raise_for_status()
             data = response.json()
             result = data["message"]["content"]
             
-            duration = time.time() - start_time
-            instrumentation.log_operation("ollama_chat", True, duration, 
-                                        model=model, message_count=len(messages), 
-                                        response_length=len(result))
+            if instrumentation.enabled:
+                duration = _now() - start_time
+                instrumentation.log_operation("ollama_chat", True, duration, 
+                                            model=model, message_count=len(messages), 
+                                            response_length=len(result))
             return result
         except Exception as e:
-            duration = time.time() - start_time
-            instrumentation.log_operation("ollama_chat", False, duration, e,
-                                        model=model, message_count=len(messages))
+            self._last_health = (0.0, False)
+            if instrumentation.enabled:
+                duration = _now() - start_time
+                instrumentation.log_operation("ollama_chat", False, duration, e,
+                                            model=model, message_count=len(messages))
             raise
 
     def chat_stream(
@@ -94,7 +164,91 @@ class OllamaProvider(ModelProvider):
         **kwargs
     ) -> Generator[str, None, None]:
         """Streaming chat completion."""
-        start_time = time.time()
+        start_time = _now()
+        total_content = ""
+        try:
+            url = f"{self._base_url()}/api/chat"
+            payload = {
+                "model": model,
+                "stream": True,
+                "messages": self._with_system_message(system_prompt, messages),
+            }
+
+            with self._get_session().post(url, data=encode_body(payload), headers=JSON_HEADERS, timeout=timeout_s, stream=True) as response:
+                response.raise_for_status()
+                for line in iter_ndjson_lines(response):
+                    content, done = _parse_stream_line(line)
+                    if content:
+                        total_content += content
+                        yield content
+                    if done:
+                        break
+            
+            if instrumentation.enabled:
+                duration = _now() - start_time
+                instrumentation.log_operation("ollama_chat_stream", True, duration,
+                                            model=model, message_count=len(messages),
+                                            response_length=len(total_content))
+        except Exception as e:
+            self._last_health = (0.0, False)
+            if instrumentation.enabled:
+                duration = _now() - start_time
+                instrumentation.log_operation("ollama_chat_stream", False, duration, e,
+                                            model=model, message_count=len(messages),
+                                            partial_response_length=len(total_content))
+            raise
+
+    @rejects_response_cache
+    async def chat_async(
+        self,
+        model: str,
+        system_prompt: str,
+        messages: List[Dict[str, str]],
+        timeout_s: int = 120,
+        **kwargs
+    ) -> str:
+        """Async non-streaming chat completion over the shared httpx pool."""
+        from ._http import get_async_client
+
+        start_time = _now()
+        try:
+            url = f"{self._base_url()}/api/chat"
+            payload = {
+                "model": model,
+                "stream": False,
+                "messages": [{"role": "system", "content": system_prompt}] + messages,
+            }
+
+            response = await get_async_client().post(url, content=encode_body(payload), headers=JSON_HEADERS, timeout=timeout_s)
+            response.raise_for_status()
+            result = response.json()["message"]["content"]
+
+            if instrumentation.enabled:
+                duration = _now() - start_time
+                instrumentation.log_operation("ollama_chat_async", True, duration,
+                                            model=model, message_count=len(messages),
+                                            response_length=len(result))
+            return result
+        except Exception as e:
+            self._last_health = (0.0, False)
+            if instrumentation.enabled:
+                duration = _now() - start_time
+                instrumentation.log_operation("ollama_chat_async", False, duration, e,
+                                            model=model, message_count=len(messages))
+            raise
+
+    async def chat_stream_async(
+        self,
+        model: str,
+        system_prompt: str,
+        messages: List[Dict[str, str]],
+        timeout_s: int = 120,
+        **kwargs
+    ) -> AsyncGenerator[str, None]:
+        """Async streaming chat completion over the shared httpx pool."""
+        from ._http import get_async_client
+
+        start_time = _now()
         total_content = ""
         try:
             url = f"{self._base_url()}/api/chat"
@@ -104,40 +258,49 @@ class OllamaProvider(ModelProvider):
                 "messages": [{"role": "system", "content": system_prompt}] + messages,
             }
 
-            with requests.post(url, json=payload, timeout=timeout_s, stream=True) as response:
+            async with get_async_client().stream("POST", url, content=encode_body(payload), headers=JSON_HEADERS, timeout=timeout_s) as response:
                 response.raise_for_status()
-                for line in response.iter_lines():
+                async for line in response.aiter_lines():
                     if line:
-                        import json
-                        data = json.loads(line)
-                        if "message" in data and "content" in data["message"]:
-                            content = data["message"]["content"]
+                        content, done = _parse_stream_line(line)
+                        if content:
                             total_content += content
                             yield content
-                        if data.get("done", False):
+                        if done:
                             break
-            
-            duration = time.time() - start_time
-            instrumentation.log_operation("ollama_chat_stream", True, duration,
-                                        model=model, message_count=len(messages),
-                                        response_length=len(total_content))
+
+            if instrumentation.enabled:
+                duration = _now() - start_time
+                instrumentation.log_operation("ollama_chat_stream_async", True, duration,
+                                            model=model, message_count=len(messages),
+                                            response_length=len(total_content))
         except Exception as e:
-            duration = time.time() - start_time
-            instrumentation.log_operation("ollama_chat_stream", False, duration, e,
-                                        model=model, message_count=len(messages),
-                                        partial_response_length=len(total_content))
+            self._last_health = (0.0, False)
+            if instrumentation.enabled:
+                duration = _now() - start_time
+                instrumentation.log_operation("ollama_chat_stream_async", False, duration, e,
+                                            model=model, message_count=len(messages),
+                                            partial_response_length=len(total_content))
             raise
 
     def health_check(self) -> bool:
-        """Check if Ollama is running."""
-        start_time = time.time()
+        """Check if Ollama is running (result cached for HEALTH_CACHE_TTL_S seconds)."""
+        checked_at, healthy = self._last_health
+        if checked_at and time.monotonic() - checked_at < self.HEALTH_CACHE_TTL_S:
+            return healthy
+
+        start_time = _now()
         try:
-            response = requests.get(f"{self._base_url()}/api/tags", timeout=5)
+            response = self._get_session().get(f"{self._base_url()}/api/tags", timeout=5)
             response.raise_for_status()
-            duration = time.time() - start_time
-            instrumentation.log_operation("ollama_health_check", True, duration)
-            return True
+            healthy = True
+            if instrumentation.enabled:
+                duration = _now() - start_time
+                instrumentation.log_operation("ollama_health_check", True, duration)
         except Exception as e:
-            duration = time.time() - start_time
-            instrumentation.log_operation("ollama_health_check", False, duration, e)
-            return False
\ No newline at end of file
+            healthy = False
+            if instrumentation.enabled:
+                duration = _now() - start_time
+                instrumentation.log_operation("ollama_health_check", False, duration, e)
+        self._last_health = (time.monotonic(), healthy)
+        return healthy
@@ -2,13 +2,17 @@
 OpenAI model provider implementation.
 """
 from __future__ import annotations
-from typing import List, Dict, Any, Optional, Generator
+from typing import List, Dict, Any, Optional, Generator, AsyncGenerator
 import os
 import time
+import weakref
 from openai import OpenAI
-from . import ModelProvider
+from . import ModelProvider, cached_response, rejects_response_cache
 from instrumentation import instrumentation
 
+# Monotonic clock for operation durations
+_now = time.perf_counter
+
 
 class OpenAIProvider(ModelProvider):
     """OpenAI model provider."""
@@ -18,6 +22,8 @@ class OpenAIProvider(ModelProvider):
     def __init__(self, api_key: Optional[str] = None):
         super().__init__(api_key)
         self._client = None
+        # One AsyncOpenAI client per event loop
+        self._async_clients = weakref.WeakKeyDictionary()
 
     @property
     def client(self):
@@ -26,6 +32,15 @@ class OpenAIProvider(ModelProvider):
             self._client = OpenAI(api_key=self.api_key)
         return self._client
 
+    @property
+    def async_client(self):
+        """Lazy initialization of the AsyncOpenAI client for the running event loop."""
+        if not self.api_key:
+            return None
+        from openai import AsyncOpenAI
+        from ._http import per_loop
+        return per_loop(self._async_clients, lambda: AsyncOpenAI(api_key=self.api_key))
+
     @property
     def name(self) -> str:
         return "OpenAI"
@@ -43,6 +58,7 @@ class OpenAIProvider(ModelProvider):
     def _get_api_key(self) -> Optional[str]:
         return os.getenv("OPENAI_API_KEY")
 
+    @cached_response
     def chat(
         self,
         model: str,
@@ -51,23 +67,25 @@ class OpenAIProvider(ModelProvider):
         **kwargs
     ) -> str:
         """Non-streaming chat completion."""
-        start_time = time.time()
+        start_time = _now()
         try:
             response = self.client.chat.completions.create(
                 model=model,
-                messages=[{"role": "system", "content": system_prompt}] + messages,
+                messages=self._with_system_message(system_prompt, messages),
                 **kwargs
             )
             result = response.choices[0].message.content
-            duration = time.time() - start_time
-            instrumentation.log_operation("openai_chat", True, duration,
-                                        model=model, message_count=len(messages),
-                                        response_length=len(result))
+            if instrumentation.enabled:
+                duration = _now() - start_time
+                instrumentation.log_operation("openai_chat", True, duration,
+                                            model=model, message_count=len(messages),
+                                            response_length=len(result))
             return result
         except Exception as e:
-            duration = time.time() - start_time
-            instrumentation.log_operation("openai_chat", False, duration, e,
-                                        model=model, message_count=len(messages))
+            if instrumentation.enabled:
+                duration = _now() - start_time
+                instrumentation.log_operation("openai_chat", False, duration, e,
+                                            model=model, message_count=len(messages))
             raise Exception(f"OpenAI API error: {e}")
 
     def chat_stream(
@@ -78,43 +96,114 @@ class OpenAIProvider(ModelProvider):
         **kwargs
     ) -> Generator[str, None, None]:
         """Streaming chat completion."""
-        start_time = time.time()
+        start_time = _now()
         total_content = ""
         try:
             response = self.client.chat.completions.create(
                 model=model,
-                messages=[{"role": "system", "content": system_prompt}] + messages,
+                messages=self._with_system_message(system_prompt, messages),
                 stream=True,
                 **kwargs
             )
 
             for chunk in response:
-                if chunk.choices[0].delta.content:
-                    content = chunk.choices[0].delta.content
+                content = chunk.choices[0].delta.content
+                if content:
                     total_content += content
                     yield content
             
-            duration = time.time() - start_time
-            instrumentation.log_operation("openai_chat_stream", True, duration,
-                                        model=model, message_count=len(messages),
-                                        response_length=len(total_content))
+            if instrumentation.enabled:
+                duration = _now() - start_time
+                instrumentation.log_operation("openai_chat_stream", True, duration,
+                                            model=model, message_count=len(messages),
+                                            response_length=len(total_content))
+        except Exception as e:
+            if instrumentation.enabled:
+                duration = _now() - start_time
+                instrumentation.log_operation("openai_chat_stream", False, duration, e,
+                                            model=model, message_count=len(messages),
+                                            partial_response_length=len(total_content))
+            raise Exception(f"OpenAI API error: {e}")
+
+    @rejects_response_cache
+    async def chat_async(
+        self,
+        model: str,
+        system_prompt: str,
+        messages: List[Dict[str, str]],
+        **kwargs
+    ) -> str:
+        """Async non-streaming chat completion."""
+        start_time = _now()
+        try:
+            response = await self.async_client.chat.completions.create(
+                model=model,
+                messages=[{"role": "system", "content": system_prompt}] + messages,
+                **kwargs
+            )
+            result = response.choices[0].message.content
+            if instrumentation.enabled:
+                duration = _now() - start_time
+                instrumentation.log_operation("openai_chat_async", True, duration,
+                                            model=model, message_count=len(messages),
+                                            response_length=len(result))
+            return result
+        except Exception as e:
+            if instrumentation.enabled:
+                duration = _now() - start_time
+                instrumentation.log_operation("openai_chat_async", False, duration, e,
+                                            model=model, message_count=len(messages))
+            raise Exception(f"OpenAI API error: {e}")
+
+    async def chat_stream_async(
+        self,
+        model: str,
+        system_prompt: str,
+        messages: List[Dict[str, str]],
+        **kwargs
+    ) -> AsyncGenerator[str, None]:
+        """Async streaming chat completion."""
+        start_time = _now()
+        total_content = ""
+        try:
+            response = await self.async_client.chat.completions.create(
+                model=model,
+                messages=[{"role": "system", "content": system_prompt}] + messages,
+                stream=True,
+                **kwargs
+            )
+
+            async for chunk in response:
+                content = chunk.choices[0].delta.content
+                if content:
+                    total_content += content
+                    yield content
+
+            if instrumentation.enabled:
+                duration = _now() - start_time
+                instrumentation.log_operation("openai_chat_stream_async", True, duration,
+                                            model=model, message_count=len(messages),
+                                            response_length=len(total_content))
         except Exception as e:
-            duration = time.time() - start_time
-            instrumentation.log_operation("openai_chat_stream", False, duration, e,
-                                        model=model, message_count=len(messages),
-                                        partial_response_length=len(total_content))
+            if instrumentation.enabled:
+                duration = _now() - start_time
+                instrumentation.log_operation("openai_chat_stream_async", False, duration, e,
+                                            model=model, message_count=len(messages),
+                                            partial_response_length=len(total_content))
             raise Exception(f"OpenAI API error: {e}")
 
     def health_check(self) -> bool:
         """Check if OpenAI API is accessible."""
-        start_time = time.time()
+        start_time = _now()
         try:
             # Simple test request
             self.client.models.list(limit=1)
-            duration = time.time() - start_time
-            instrumentation.log_operation("openai_health_check", True, duration)
+            if instrumentation.enabled:
+                duration = _now() - start_time
+                instrumentation.log_operation("openai_health_check", True, duration)
             return True
         except Exception as e:
-            duration = time.time() - start_time
-            instrumentation.log_operation("openai_health_check", False, duration, e)
+            if instrumentation.enabled:
+                duration = _now() - start_time
+                instrumentation.log_operation("openai_health_check", False, duration, e)
             return False
\ No newline at end of file
@@ -1,21 +1,46 @@
 """
 Model provider registry setup.
 """
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+# Provider name -> "module:Class"; SDKs are only imported when a provider is first used
+PROVIDER_PATHS = {
+    "Ollama": "models.ollama_provider:OllamaProvider",
+    "OpenAI": "models.openai_provider:OpenAIProvider",
+    "Anthropic": "models.anthropic_provider:AnthropicProvider",
+    "Google": "models.google_provider:GoogleProvider",
+    "xAI": "models.xai_provider:xAIProvider",
+    "DeepSeek": "models.deepseek_provider:DeepSeekProvider",
+}
+
+# Registries already populated by setup_providers()
+_SET_UP: "weakref.WeakSet" = weakref.WeakSet()
 
 
 def setup_providers(registry):
-    """Register all available model provider classes."""
-    # Import here to avoid circular imports
-    from .ollama_provider import OllamaProvider
-    from .openai_provider import OpenAIProvider
-    from .anthropic_provider import AnthropicProvider
-    from .google_provider import GoogleProvider
-    from .xai_provider import xAIProvider
-    from .deepseek_provider import DeepSeekProvider
-    
-    registry.register(OllamaProvider)
-    registry.register(OpenAIProvider)
-    registry.register(AnthropicProvider)
-    registry.register(GoogleProvider)
-    registry.register(xAIProvider)
-    registry.register(DeepSeekProvider)
\ No newline at end of file
+    """Register all available model providers without importing them (once per registry)."""
+    if registry in _SET_UP:
+        return
+    for name, target in PROVIDER_PATHS.items():
+        registry.register_lazy(name, target)
+    _SET_UP.add(registry)
+
+
+def health_check_all(registry) -> Dict[str, bool]:
+    """Run every registered provider's health check concurrently; returns {provider name: healthy}."""
+    names = registry.get_available_providers()
+    if not names:
+        return {}
+
+    def check(name: str) -> bool:
+        try:
+            provider = registry.get_provider(name)
+            return bool(provider and provider.health_check())
+        except Exception:
+            return False
+
+    # Checks are network-bound, so total time is the slowest check rather than the sum
+    with ThreadPoolExecutor(max_workers=len(names)) as executor:
+        return dict(zip(names, executor.map(check, names)))
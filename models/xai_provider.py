@@ -2,10 +2,11 @@
 xAI (Grok) model provider implementation.
 """
 from __future__ import annotations
-from typing import List, Dict, Any, Optional, Generator
+from typing import List, Dict, Any, Optional, Generator, AsyncGenerator
 import os
+import weakref
 from openai import OpenAI
-from . import ModelProvider
+from . import ModelProvider, cached_response, rejects_response_cache
 
 
 class xAIProvider(ModelProvider):
@@ -16,6 +17,8 @@ class xAIProvider(ModelProvider):
     def __init__(self, api_key: Optional[str] = None):
         super().__init__(api_key)
         self._client = None
+        # One AsyncOpenAI client per event loop
+        self._async_clients = weakref.WeakKeyDictionary()
 
     @property
     def client(self):
@@ -27,6 +30,18 @@ class xAIProvider(ModelProvider):
             )
         return self._client
 
+    @property
+    def async_client(self):
+        """Lazy initialization of the async xAI client for the running event loop."""
+        if not self.api_key:
+            return None
+        from openai import AsyncOpenAI
+        from ._http import per_loop
+        return per_loop(
+            self._async_clients,
+            lambda: AsyncOpenAI(api_key=self.api_key, base_url="https://api.x.ai/v1")
+        )
+
     @property
     def name(self) -> str:
         return "xAI"
@@ -41,6 +56,7 @@ class xAIProvider(ModelProvider):
     def _get_api_key(self) -> Optional[str]:
         return os.getenv("XAI_API_KEY")
 
+    @cached_response
     def chat(
         self,
         model: str,
@@ -82,8 +98,57 @@ class xAIProvider(ModelProvider):
             )
 
             for chunk in response:
-                if chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
+                content = chunk.choices[0].delta.content
+                if content:
+                    yield content
+        except Exception as e:
+            raise Exception(f"xAI API error: {e}")
+
+    @rejects_response_cache
+    async def chat_async(
+        self,
+        model: str,
+        system_prompt: str,
+        messages: List[Dict[str, str]],
+        **kwargs
+    ) -> str:
+        """Async non-streaming chat completion."""
+        if not self.api_key:
+            raise Exception("xAI API key not configured")
+
+        try:
+            response = await self.async_client.chat.completions.create(
+                model=model,
+                messages=[{"role": "system", "content": system_prompt}] + messages,
+                **kwargs
+            )
+            return response.choices[0].message.content
+        except Exception as e:
+            raise Exception(f"xAI API error: {e}")
+
+    async def chat_stream_async(
+        self,
+        model: str,
+        system_prompt: str,
+        messages: List[Dict[str, str]],
+        **kwargs
+    ) -> AsyncGenerator[str, None]:
+        """Async streaming chat completion."""
+        if not self.api_key:
+            raise Exception("xAI API key not configured")
+
+        try:
+            response = await self.async_client.chat.completions.create(
+                model=model,
+                messages=[{"role": "system", "content": system_prompt}] + messages,
+                stream=True,
+                **kwargs
+            )
+
+            async for chunk in response:
+                content = chunk.choices[0].delta.content
+                if content:
+                    yield content
         except Exception as e:
             raise Exception(f"xAI API error: {e}")
 
@@ -0,0 +1,40 @@
+"""
+JSON wire helpers shared by the Ollama client and the Ollama model provider.
+"""
+from __future__ import annotations
+from typing import Any, Dict, Generator
+
+try:
+    import orjson as _json  # faster request encoding and NDJSON stream parsing
+except ImportError:
+    import json as _json
+
+loads = _json.loads
+
+# Shared empty mapping for stream lines without a "message" object
+EMPTY: Dict[str, Any] = {}
+
+# Request bodies are pre-serialised (see encode_body) and sent with this header
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def encode_body(payload: Dict[str, Any]) -> bytes:
+    """Serialise a request payload to JSON bytes."""
+    body = _json.dumps(payload)
+    return body if isinstance(body, bytes) else body.encode()
+
+
+def iter_ndjson_lines(response, chunk_size: int = 8192) -> Generator[bytearray, None, None]:
+    """Split a streamed NDJSON response body into non-empty lines (without decoding)."""
+    buf = bytearray()
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        buf += chunk
+        start = 0
+        while (nl := buf.find(b"\n", start)) != -1:
+            if nl > start:
+                yield buf[start:nl]
+            start = nl + 1
+        if start:
+            del buf[:start]
+    if buf:
+        yield buf
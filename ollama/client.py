@@ -1,8 +1,23 @@
 from __future__ import annotations
+import functools
 import os
 import time
 import requests
+from requests.adapters import HTTPAdapter
 from typing import List, Dict, Any, Generator, Optional
+from ._wire import EMPTY, JSON_HEADERS, encode_body, iter_ndjson_lines, loads
+
+
+@functools.lru_cache(maxsize=64)
+def _system_message(system_prompt: str) -> Dict[str, str]:
+    """System message for a prompt, shared between calls (it is never mutated)."""
+    return {"role": "system", "content": system_prompt}
+
+
+# Keep-alive connection pool for all Ollama requests (created on first use)
+_SESSION: Optional[requests.Session] = None
+# OLLAMA_URL as read on first use; see _reset_base_url_cache()
+_CACHED_BASE_URL: Optional[str] = None
 
 
 class OllamaConnectionError(Exception):
@@ -10,8 +25,29 @@ class OllamaConnectionError(Exception):
     pass
 
 
+def _get_session() -> requests.Session:
+    """Get the shared HTTP session, creating it on first use."""
+    global _SESSION
+    if _SESSION is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=0)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _SESSION = session
+    return _SESSION
+
+
 def _base_url() -> str:
-    return os.getenv("OLLAMA_URL", "http://localhost:11434").rstrip("/")
+    global _CACHED_BASE_URL
+    if _CACHED_BASE_URL is None:
+        _CACHED_BASE_URL = os.getenv("OLLAMA_URL", "http://localhost:11434").rstrip("/")
+    return _CACHED_BASE_URL
+
+
+def _reset_base_url_cache() -> None:
+    """Re-read OLLAMA_URL on the next request."""
+    global _CACHED_BASE_URL
+    _CACHED_BASE_URL = None
 
 
 def health_check(timeout_s: int = 5) -> bool:
@@ -20,7 +56,7 @@ def health_check(timeout_s: int = 5) -> bool:
     Returns True if healthy, raises OllamaConnectionError otherwise.
     """
     try:
-        r = requests.get(f"{_base_url()}/api/tags", timeout=timeout_s)
+        r = _get_session().get(f"{_base_url()}/api/tags", timeout=timeout_s)
         r.raise_for_status()
         return True
     except requests.exceptions.ConnectionError:
@@ -60,13 +96,17 @@ def chat(
     payload: Dict[str, Any] = {
         "model": model,
         "stream": False,
-        "messages": [{"role": "system", "content": system_prompt}] + messages,
+        "messages": [_system_message(system_prompt), *messages],
     }
 
+    # Encode once; retries resend the same body over the pooled session
+    body = encode_body(payload)
+    session = _get_session()
+
     last_error: Optional[Exception] = None
     for attempt in range(max_retries):
         try:
-            r = requests.post(url, json=payload, timeout=timeout_s)
+            r = session.post(url, data=body, headers=JSON_HEADERS, timeout=timeout_s)
             r.raise_for_status()
             data = r.json()
             return data["message"]["content"]
@@ -107,20 +147,19 @@ def chat_stream(
     payload: Dict[str, Any] = {
         "model": model,
         "stream": True,
-        "messages": [{"role": "system", "content": system_prompt}] + messages,
+        "messages": [_system_message(system_prompt), *messages],
     }
 
     try:
-        with requests.post(url, json=payload, timeout=timeout_s, stream=True) as r:
+        with _get_session().post(url, data=encode_body(payload), headers=JSON_HEADERS, timeout=timeout_s, stream=True) as r:
             r.raise_for_status()
-            for line in r.iter_lines():
-                if line:
-                    import json
-                    data = json.loads(line)
-                    if "message" in data and "content" in data["message"]:
-                        yield data["message"]["content"]
-                    if data.get("done", False):
-                        break
+            for line in iter_ndjson_lines(r):
+                data = loads(line)
+                content = data.get("message", EMPTY).get("content")
+                if content:
+                    yield content
+                if data.get("done"):
+                    break
     except requests.exceptions.ConnectionError:
         raise OllamaConnectionError(
             f"Cannot connect to Ollama at {_base_url()}. Is it running?"
@@ -1,10 +1,12 @@
 """Personas module - WoW-style persona configuration and prompt building."""
 
-from .presets import PRESETS, CLASS_FLAVOR, SPEC_BEHAVIOR, PersonaPreset
+from .presets import PRESETS, PRESETS_BY_KEY, PRESET_KEYS, CLASS_FLAVOR, SPEC_BEHAVIOR, PersonaPreset
 from .prompt_builder import PersonaConfig, build_system_prompt
 
 __all__ = [
     "PRESETS",
+    "PRESETS_BY_KEY",
+    "PRESET_KEYS",
     "CLASS_FLAVOR",
     "SPEC_BEHAVIOR",
     "PersonaPreset",
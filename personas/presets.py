@@ -1,8 +1,9 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Dict, List
+import sys
+from dataclasses import dataclass, replace
+from typing import Dict, FrozenSet, List
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PersonaPreset:
     key: str
     title: str
@@ -188,3 +189,14 @@ PRESETS: List[PersonaPreset] = [
         avatar="🌩️",
     ),
 ]
+
+# Intern the shared text/emoji values so every table, preset and prompt reuses one object;
+# class names too, so lookups in other class-keyed tables (e.g. themes) match on identity
+CLASS_FLAVOR = {sys.intern(k): sys.intern(v) for k, v in CLASS_FLAVOR.items()}
+SPEC_BEHAVIOR = {k: sys.intern(v) for k, v in SPEC_BEHAVIOR.items()}
+CLASS_AVATAR = {k: sys.intern(v) for k, v in CLASS_AVATAR.items()}
+PRESETS = [replace(p, avatar=sys.intern(p.avatar)) for p in PRESETS]
+
+# Constant-time preset lookup by key (insertion order matches PRESETS)
+PRESETS_BY_KEY: Dict[str, PersonaPreset] = {p.key: p for p in PRESETS}
+PRESET_KEYS: FrozenSet[str] = frozenset(PRESETS_BY_KEY)
@@ -1,9 +1,29 @@
 from __future__ import annotations
-from dataclasses import dataclass, asdict
-import json
-import os
-from typing import Optional
-from personas.presets import CLASS_FLAVOR, SPEC_BEHAVIOR
+from dataclasses import dataclass, field, fields
+from operator import attrgetter
+import functools
+from typing import ClassVar, Dict, Iterable, List, Optional, Tuple
+from personas.presets import CLASS_FLAVOR, SPEC_BEHAVIOR, PersonaPreset
+
+# Valid values for build_system_prompt validation
+_CLASS_KEYS = frozenset(CLASS_FLAVOR)
+_SPEC_KEYS = frozenset(SPEC_BEHAVIOR)
+_MODES = frozenset(("Work", "Play"))
+
+# Directories save_to_file() has already created, so repeat saves skip the makedirs() stat
+_MKDIR_CACHE: set = set()
+
+# (field, min, max) for every PersonaConfig slider
+_BOUNDS = (
+    ("verbosity", 1, 10),
+    ("humor", 0, 10),
+    ("assertiveness", 1, 10),
+    ("creativity", 0, 10),
+    ("formality", 0, 10),
+    ("empathy", 0, 10),
+    ("technical_level", 0, 10),
+    ("patience", 1, 10),
+)
 
 
 class PersonaValidationError(ValueError):
@@ -11,7 +31,7 @@ class PersonaValidationError(ValueError):
     pass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PersonaConfig:
     version_codename: str
     cls: str
@@ -27,55 +47,95 @@ class PersonaConfig:
     patience: int   # 1-10: How patient/detailed the responses should be
     name: str = ""  # Optional persona name
     avatar: str = ""  # Optional avatar emoji or image path
+    # Memoized __hash__ result; not part of equality or serialization
+    _hash: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+
+    # Field names in declaration order, filled in below the class
+    _FIELDS: ClassVar[Tuple[str, ...]] = ()
 
     def __post_init__(self):
         """Validate all fields after initialization."""
-        self._validate_slider("verbosity", self.verbosity, 1, 10)
-        self._validate_slider("humor", self.humor, 0, 10)
-        self._validate_slider("assertiveness", self.assertiveness, 1, 10)
-        self._validate_slider("creativity", self.creativity, 0, 10)
-        self._validate_slider("formality", self.formality, 0, 10)
-        self._validate_slider("empathy", self.empathy, 0, 10)
-        self._validate_slider("technical_level", self.technical_level, 0, 10)
-        self._validate_slider("patience", self.patience, 1, 10)
+        for name, min_val, max_val in _BOUNDS:
+            value = getattr(self, name)
+            # bool is an int subclass but never a valid slider value
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise PersonaValidationError(f"{name} must be an integer, got {type(value).__name__}")
+            if value < min_val or value > max_val:
+                raise PersonaValidationError(f"{name} must be between {min_val} and {max_val}, got {value}")
 
         if not self.version_codename or not self.version_codename.strip():
             raise PersonaValidationError("version_codename cannot be empty")
 
-    def _validate_slider(self, name: str, value: int, min_val: int, max_val: int) -> None:
-        """Validate a slider value is within bounds."""
-        if not isinstance(value, int):
-            raise PersonaValidationError(f"{name} must be an integer, got {type(value).__name__}")
-        if value < min_val or value > max_val:
-            raise PersonaValidationError(f"{name} must be between {min_val} and {max_val}, got {value}")
+    def __hash__(self) -> int:
+        h = self._hash
+        if h is None:
+            h = hash(_get_field_values(self))
+            object.__setattr__(self, "_hash", h)
+        return h
 
     def to_dict(self) -> dict:
         """Convert persona config to dictionary for JSON serialization."""
-        return asdict(self)
+        # All fields are str/int, so a shallow read of the slots is a full copy
+        return dict(zip(self._FIELDS, _get_field_values(self)))
 
     @classmethod
     def from_dict(cls, data: dict) -> PersonaConfig:
         """Create persona config from dictionary."""
         return cls(**data)
 
-    def save_to_file(self, filepath: str) -> None:
-        """Save persona config to JSON file."""
+    def to_json(self, *, pretty: bool = False) -> str:
+        """Serialize persona config to a JSON string (compact unless pretty=True)."""
+        # Persistence-only import, deferred so importing the prompt builder stays light
+        import json
+
+        if pretty:
+            return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+        # Compact output stays on the C encoder fast path
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text: str) -> PersonaConfig:
+        """Create persona config from a JSON string."""
+        import json
+
+        return cls.from_dict(json.loads(text))
+
+    def save_to_file(self, filepath: str, *, pretty: bool = False) -> None:
+        """Save persona config to JSON file (compact unless pretty=True)."""
+        import os
+
         try:
             # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+            directory = os.path.dirname(filepath)
+            if directory and directory not in _MKDIR_CACHE:
+                os.makedirs(directory, exist_ok=True)
+                _MKDIR_CACHE.add(directory)
+
+            text = self.to_json(pretty=pretty)
+            try:
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    f.write(text)
+            except FileNotFoundError:
+                if not directory:
+                    raise
+                # The directory was removed since it was cached; recreate it and retry once
+                _MKDIR_CACHE.discard(directory)
+                os.makedirs(directory, exist_ok=True)
+                _MKDIR_CACHE.add(directory)
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    f.write(text)
         except Exception as e:
             raise PersonaValidationError(f"Failed to save persona: {e}")
 
     @classmethod
     def load_from_file(cls, filepath: str) -> PersonaConfig:
         """Load persona config from JSON file."""
+        import json
+
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            return cls.from_dict(data)
+                text = f.read()
+            return cls.from_json(text)
         except FileNotFoundError:
             raise PersonaValidationError(f"Persona file not found: {filepath}")
         except json.JSONDecodeError as e:
@@ -83,24 +143,62 @@ class PersonaConfig:
         except Exception as e:
             raise PersonaValidationError(f"Failed to load persona: {e}")
 
+
+PersonaConfig._FIELDS = tuple(f.name for f in fields(PersonaConfig) if f.init)
+# Reads every field in one C-level call
+_get_field_values = attrgetter(*PersonaConfig._FIELDS)
+
+
 def build_system_prompt(cfg: PersonaConfig) -> str:
-    if cfg.cls not in CLASS_FLAVOR:
+    if cfg.cls not in _CLASS_KEYS:
         raise ValueError(f"Unknown class: {cfg.cls}")
-    if cfg.spec not in SPEC_BEHAVIOR:
+    if cfg.spec not in _SPEC_KEYS:
         raise ValueError(f"Unknown spec: {cfg.spec}")
-    if cfg.mode not in ("Work", "Play"):
+    if cfg.mode not in _MODES:
         raise ValueError("mode must be 'Work' or 'Play'")
 
-    mode_rules = (
-        "Work Mode: prioritize clarity and correctness; keep roleplay subtle."
-        if cfg.mode == "Work"
-        else "Play Mode: allow stronger flavor, but keep it obviously a UI persona, not a 'being'."
+    # Key the cache on the prompt-relevant fields only (avatar doesn't affect the prompt)
+    return _build_cached(
+        cfg.cls, cfg.spec, cfg.mode, _get_slider_values(cfg), cfg.name, cfg.version_codename,
     )
 
-    name_part = f" \"{cfg.name}\"" if cfg.name else ""
-    return f"""You are ChatGPT running in Persona Mode.{f" Your name is {cfg.name}." if cfg.name else ""}
 
-Persona Badge: {cfg.version_codename}{name_part} | Class={cfg.cls} | Spec={cfg.spec} | Mode={cfg.mode}
+def check_presets(presets: Iterable[PersonaPreset]) -> Dict[str, List[str]]:
+    """Check presets in a single pass; maps each check to the keys of the presets failing it."""
+    failures: Dict[str, List[str]] = {"cls": [], "spec": [], "mode": [], "sliders": []}
+    for preset in presets:
+        if preset.cls not in _CLASS_KEYS:
+            failures["cls"].append(preset.key)
+        if preset.spec not in _SPEC_KEYS:
+            failures["spec"].append(preset.key)
+        if preset.mode not in _MODES:
+            failures["mode"].append(preset.key)
+        if any(not min_val <= getattr(preset, name) <= max_val for name, min_val, max_val in _BOUNDS):
+            failures["sliders"].append(preset.key)
+    return failures
+
+
+# (label, PersonaConfig field) for each line of the "Style sliders" block, in prompt order
+_SLIDER_LABELS = (
+    ("Verbosity", "verbosity"),
+    ("Humor", "humor"),
+    ("Assertiveness", "assertiveness"),
+    ("Creativity", "creativity"),
+    ("Formality", "formality"),
+    ("Empathy", "empathy"),
+    ("Technical Level", "technical_level"),
+    ("Patience", "patience"),
+)
+_get_slider_values = attrgetter(*(attr for _, attr in _SLIDER_LABELS))
+
+_MODE_RULES = {
+    "Work": "Work Mode: prioritize clarity and correctness; keep roleplay subtle.",
+    "Play": "Play Mode: allow stronger flavor, but keep it obviously a UI persona, not a 'being'.",
+}
+
+_PROMPT_TEMPLATE = """You are ChatGPT running in Persona Mode.{name_sentence}
+
+Persona Badge: {version_codename}{name_part} | Class={cls} | Spec={spec} | Mode={mode}
 
 Core rules:
 - You are a tool. Do not claim sentience, secret access, or relationship status.
@@ -109,18 +207,34 @@ Core rules:
 - If asked for financial/legal/medical advice, be cautious and suggest consulting a qualified professional when appropriate.
 
 Style sliders:
-- Verbosity: {cfg.verbosity}/10
-- Humor: {cfg.humor}/10
-- Assertiveness: {cfg.assertiveness}/10
-- Creativity: {cfg.creativity}/10
-- Formality: {cfg.formality}/10
-- Empathy: {cfg.empathy}/10
-- Technical Level: {cfg.technical_level}/10
-- Patience: {cfg.patience}/10
-
-Class flavor:
-{CLASS_FLAVOR[cfg.cls]}
-
-Spec behavior:
-{SPEC_BEHAVIOR[cfg.spec]}
+{sliders_block}
+
+{class_spec_block}
 """
+
+# Every (class, spec) combination's closing block, built once at import
+_CS_BLOCK = {
+    (c, s): f"Class flavor:\n{cf}\n\nSpec behavior:\n{sb}"
+    for c, cf in CLASS_FLAVOR.items()
+    for s, sb in SPEC_BEHAVIOR.items()
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _build_cached(
+    cls: str, spec: str, mode: str, sliders: Tuple[int, ...], name: str, version_codename: str,
+) -> str:
+    sliders_block = "\n".join([
+        f"- {label}: {value}/10" for (label, _), value in zip(_SLIDER_LABELS, sliders)
+    ])
+    return _PROMPT_TEMPLATE.format(
+        name_sentence=f" Your name is {name}." if name else "",
+        version_codename=version_codename,
+        name_part=f" \"{name}\"" if name else "",
+        cls=cls,
+        spec=spec,
+        mode=mode,
+        mode_rules=_MODE_RULES[mode],
+        sliders_block=sliders_block,
+        class_spec_block=_CS_BLOCK[(cls, spec)],
+    )
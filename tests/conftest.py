@@ -0,0 +1,13 @@
+"""
+Shared pytest fixtures.
+"""
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _setup_providers_once():
+    """Register the model providers once for the whole test session."""
+    from models import registry
+    from models.providers import setup_providers
+
+    setup_providers(registry)
@@ -141,6 +141,53 @@ class TestConversation:
         assert len(data["messages"]) == 1
         assert data["messages"][0]["content"] == "Test message"
 
+    def test_added_message_timestamp_is_formatted_on_use(self):
+        """Test that add_message timestamps serialize as current ISO times."""
+        conv = Conversation.new(
+            persona_name="Test",
+            persona_class="Test",
+            persona_spec="Test",
+            provider_name="Test",
+            model_name="Test"
+        )
+        before = datetime.now()
+        conv.add_message("user", "Test message")
+        after = datetime.now()
+
+        assert conv.messages[0].timestamp is None
+        stamp = datetime.fromisoformat(conv.to_dict()["messages"][0]["timestamp"])
+        assert abs((stamp - before).total_seconds()) < 1
+        assert abs((after - stamp).total_seconds()) < 1
+        assert conv.messages[0].timestamp == stamp.isoformat()
+
+    def test_updated_at_is_formatted_on_use(self):
+        """Test that add_message defers formatting updated_at until it is read."""
+        conv = Conversation.new(
+            persona_name="Test",
+            persona_class="Test",
+            persona_spec="Test",
+            provider_name="Test",
+            model_name="Test"
+        )
+        conv.add_message("user", "Test message")
+
+        assert conv.updated_at is None
+        data = conv.to_dict()
+        assert "updated_ns" not in data
+        assert data["updated_at"] == conv.updated_at == conv.get_updated_at()
+        assert abs((datetime.fromisoformat(data["updated_at"]) - datetime.now()).total_seconds()) < 1
+
+    def test_stale_clock_anchor_is_refreshed(self, monkeypatch):
+        """Test that message times follow the wall clock once the anchor is old."""
+        import time
+        import conversations
+        hour_ns = 3600 * 1_000_000_000
+        # An anchor taken an hour ago whose wall time has since drifted by an hour
+        monkeypatch.setattr(conversations, "_ANCHOR_NS", (time.time_ns() - 2 * hour_ns, time.monotonic_ns() - hour_ns))
+
+        assert abs(conversations._now_ns() - time.time_ns()) < 1_000_000_000
+        assert conversations._ANCHOR_NS[1] > time.monotonic_ns() - 1_000_000_000
+
     def test_conversation_from_dict(self):
         """Test creating conversation from dict."""
         data = {
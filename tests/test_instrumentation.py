@@ -3,6 +3,7 @@ Tests for the instrumentation and diagnostics system.
 """
 import pytest
 import time
+from collections import deque
 from unittest.mock import patch, MagicMock
 from instrumentation import (
     InstrumentationManager, PerformanceMetrics, SystemInfo,
@@ -17,8 +18,8 @@ class TestInstrumentationManager:
     def test_initialization(self):
         """Test that InstrumentationManager initializes correctly."""
         manager = InstrumentationManager()
-        assert manager.metrics == []
-        assert manager.errors == []
+        assert list(manager.metrics) == []
+        assert list(manager.errors) == []
         assert isinstance(manager.start_time, float)
         assert manager.start_time > 0
 
@@ -54,6 +55,42 @@ class TestInstrumentationManager:
         assert error_entry["operation"] == "test_op"
         assert "Test error" in error_entry["error"]
 
+    def test_log_operation_disabled(self):
+        """Test that nothing is recorded while instrumentation is disabled."""
+        manager = InstrumentationManager()
+        manager.enabled = False
+        manager.log_operation("test_op", False, 1.0, Exception("Test error"))
+
+        assert list(manager.metrics) == []
+        assert list(manager.errors) == []
+
+    def test_log_operation_writes_log_off_request_path(self):
+        """Test that queued operation records reach the logger on flush."""
+        from instrumentation import flush_logs
+
+        manager = InstrumentationManager()
+        flush_logs()  # drop records queued by earlier tests
+        with patch('instrumentation.logger') as mock_logger:
+            manager.log_operation("queued_op", True, 0.5, provider="test")
+            flush_logs()
+
+        mock_logger.info.assert_called_once()
+        args, kwargs = mock_logger.info.call_args
+        assert args == ("Operation completed: queued_op",)
+        assert kwargs["extra"]["provider"] == "test"
+
+    def test_log_batch_records_every_metric(self):
+        """Test that a batch of pre-built metrics is recorded like individual operations."""
+        manager = InstrumentationManager()
+        manager.log_batch([
+            PerformanceMetrics("stream_chunk", 0.0, 0.1, 0.1, True, metadata={"index": 0}),
+            PerformanceMetrics("stream_chunk", 0.1, 0.3, 0.2, False, "Stream closed"),
+        ])
+
+        assert [m.metadata for m in manager.metrics] == [{"index": 0}, {}]
+        assert manager.get_performance_summary()["operation_stats"]["stream_chunk"]["count"] == 2
+        assert manager.errors[0]["error"] == "Stream closed"
+
     def test_time_operation_context_manager(self):
         """Test the time_operation context manager."""
         manager = InstrumentationManager()
@@ -124,12 +161,12 @@ class TestInstrumentationManager:
         assert summary["error_rate"] == 0.5  # 2 errors out of 4 operations
         assert len(summary["recent_errors"]) == 2
 
-    @patch('instrumentation.psutil.virtual_memory')
-    @patch('instrumentation.psutil.disk_usage')
-    @patch('instrumentation.psutil.cpu_count')
-    @patch('instrumentation.platform.system')
-    @patch('instrumentation.platform.release')
-    @patch('instrumentation.platform.python_version')
+    @patch('psutil.virtual_memory')
+    @patch('psutil.disk_usage')
+    @patch('psutil.cpu_count')
+    @patch('platform.system')
+    @patch('platform.release')
+    @patch('platform.python_version')
     def test_get_system_info(self, mock_python_version, mock_release, mock_system,
                            mock_cpu_count, mock_disk_usage, mock_memory):
         """Test getting system information."""
@@ -157,6 +194,17 @@ class TestInstrumentationManager:
         assert sys_info.python_version == "3.12.3"
         assert sys_info.cpu_count == 8
 
+    @patch('psutil.virtual_memory')
+    def test_get_system_info_is_collected_once(self, mock_memory):
+        """Test that system info is memoized until a refresh is requested."""
+        manager = InstrumentationManager()
+        first = manager.get_system_info()
+
+        assert manager.get_system_info() is first
+        assert mock_memory.call_count == 1
+        assert manager.get_system_info(refresh=True) is not first
+        assert mock_memory.call_count == 2
+
     def test_get_performance_summary_no_metrics(self):
         """Test performance summary with no metrics."""
         manager = InstrumentationManager()
@@ -190,6 +238,19 @@ class TestInstrumentationManager:
         assert op_stats["fast_op"]["count"] == 1
         assert op_stats["fast_op"]["errors"] == 0
 
+    def test_summaries_count_operations_dropped_from_buffer(self):
+        """Test that summaries cover every operation, not just the retained metrics."""
+        manager = InstrumentationManager()
+        manager.metrics = deque(maxlen=2)
+        for i in range(4):
+            manager.log_operation("op", i % 2 == 0, 1.0, None if i % 2 == 0 else Exception("Boom"))
+
+        assert [m.success for m in manager.metrics] == [True, False]
+        assert manager.get_performance_summary()["total_operations"] == 4
+        assert manager.get_performance_summary()["operation_stats"]["op"]["errors"] == 2
+        assert manager.get_error_summary()["error_rate"] == 0.5
+        assert manager.get_error_summary()["error_types"] == {"Boom": 2}
+
 
 class TestInstrumentationFunctions:
     """Tests for the instrumentation utility functions."""
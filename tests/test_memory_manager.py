@@ -1,4 +1,5 @@
 import pytest
+from unittest.mock import patch
 from memory_manager import ContextManager, MemoryConfig, ContextStrategy, context_manager
 
 
@@ -36,6 +37,33 @@ class TestContextManager:
         tokens = context_manager.estimate_tokens(messages)
         assert tokens > 100  # Should be significantly more tokens
 
+    def test_estimate_tokens_reuses_cached_counts(self):
+        manager = ContextManager()
+        messages = [{"role": "user", "content": "Hello"}]
+        tokens = manager.estimate_tokens(messages)
+
+        with patch.object(manager, "get_token_encoder") as get_encoder:
+            assert manager.estimate_tokens(messages) == tokens
+        get_encoder.assert_not_called()
+
+        manager.clear_cache()
+        assert manager._token_cache == {}
+
+    def test_full_token_cache_mixes_cached_and_new_messages(self):
+        manager = ContextManager()
+        manager.TOKEN_CACHE_SIZE = 2
+        cached = [{"role": "user", "content": "Hello"}, {"role": "assistant", "content": "Hi there!"}]
+        expected = manager.estimate_tokens(cached)
+        assert len(manager._token_cache) == 2
+
+        new = {"role": "user", "content": "How are you?"}
+        new_tokens = manager.estimate_tokens([new])
+        manager.clear_cache()
+        manager.estimate_tokens(cached)
+
+        assert manager.estimate_tokens(cached + [new]) == expected + new_tokens
+        assert len(manager._token_cache) <= 2
+
     def test_manage_context_no_compression_needed(self):
         """Test that messages are returned unchanged when under token limit"""
         messages = [
@@ -96,6 +124,20 @@ class TestContextManager:
         # Should have fewer messages
         assert len(managed) <= len(messages)
 
+    def test_optimize_context_keep_recent(self):
+        """Test that keep-recent optimization keeps the newest messages"""
+        messages = []
+        for i in range(30):
+            messages.append({"role": "user", "content": f"Question {i}: " + "Tell me more. " * 10})
+            messages.append({"role": "assistant", "content": f"Answer {i}: " + "Here you go. " * 10})
+
+        manager = ContextManager(MemoryConfig(max_context_tokens=500, strategy=ContextStrategy.KEEP_RECENT))
+        system_prompt, optimized = manager.optimize_context("Be helpful.", messages, "gpt-3.5-turbo")
+
+        assert system_prompt == "Be helpful."
+        assert 0 < len(optimized) <= manager.config.min_messages_to_keep
+        assert optimized == messages[-len(optimized):]
+
     def test_context_strategy_enum_values(self):
         """Test that all context strategies are properly defined"""
         strategies = [strategy.value for strategy in ContextStrategy]
@@ -1,8 +1,9 @@
 """
 Tests for model providers.
 """
+import json
 import pytest
-from unittest.mock import patch, Mock
+from unittest.mock import patch, Mock, PropertyMock
 from models import registry
 from models.ollama_provider import OllamaProvider
 from models.providers import setup_providers
@@ -11,15 +12,29 @@ from models.providers import setup_providers
 class TestModelRegistry:
     """Tests for the model provider registry."""
 
-    def setup_method(self):
-        """Set up providers before each test."""
-        setup_providers(registry)
-
     def test_registry_has_providers(self):
         """Test that registry has providers registered."""
         assert len(registry.get_available_providers()) > 0
         assert "Ollama" in registry.get_available_providers()
 
+    def test_setup_providers_is_idempotent(self):
+        """Test that repeated setup keeps already-resolved providers."""
+        provider = registry.get_provider("Ollama")
+        setup_providers(registry)
+        assert registry.get_provider("Ollama") is provider
+        assert registry._provider_classes["Ollama"] is OllamaProvider
+
+    def test_health_check_all_reports_each_provider(self):
+        """Test that the concurrent health sweep returns one result per provider."""
+        from models import ModelProviderRegistry
+        from models.providers import health_check_all
+
+        registry_under_test = ModelProviderRegistry()
+        registry_under_test.register(OllamaProvider)
+        with patch.object(OllamaProvider, "health_check", return_value=True):
+            assert health_check_all(registry_under_test) == {"Ollama": True}
+        assert health_check_all(ModelProviderRegistry()) == {}
+
     def test_get_provider_returns_correct_provider(self):
         """Test getting a provider by name."""
         provider = registry.get_provider("Ollama")
@@ -42,7 +57,83 @@ class TestOllamaProvider:
         assert provider.name == "Ollama"
         assert len(provider.available_models) >= 0  # May be empty if Ollama not running
 
-    @patch('models.ollama_provider.requests.get')
+    @patch('models.ollama_provider.requests.Session.get')
+    def test_available_models_are_cached_until_refresh(self, mock_get):
+        """Test that the model list is fetched once and reused until refreshed."""
+        mock_get.return_value.json.return_value = {
+            "models": [{"name": "mistral:latest"}, {"name": "llama3.2:latest"}]
+        }
+
+        provider = OllamaProvider()
+        provider._models_cache.clear()
+        assert provider.available_models == ["llama3.2:latest", "mistral:latest"]
+        assert provider.available_models == ["llama3.2:latest", "mistral:latest"]
+        assert mock_get.call_count == 1
+
+        provider.refresh_models()
+        assert mock_get.call_count == 2
+        provider._models_cache.clear()
+
+    @patch('models.ollama_provider.requests.Session.post')
+    def test_chat_response_cache_is_opt_in(self, mock_post):
+        """Test that cache=True reuses replies and plain calls always hit the server."""
+        mock_post.return_value.json.return_value = {"message": {"content": "Hello!"}}
+        provider = OllamaProvider()
+        messages = [{"role": "user", "content": "Hi"}]
+
+        assert provider.chat("llama3.2", "Be helpful.", messages, cache=True) == "Hello!"
+        assert provider.chat("llama3.2", "Be helpful.", messages, cache=True) == "Hello!"
+        assert mock_post.call_count == 1
+
+        provider.chat("llama3.2", "Be helpful.", messages)
+        assert mock_post.call_count == 2
+
+    @patch('models.ollama_provider.requests.Session.post')
+    def test_chat_response_cache_key_includes_kwargs(self, mock_post):
+        """Test that a cached reply is only reused for the same extra arguments."""
+        mock_post.return_value.json.return_value = {"message": {"content": "Hello!"}}
+        provider = OllamaProvider()
+        messages = [{"role": "user", "content": "Hi"}]
+
+        provider.chat("llama3.2", "Be helpful.", messages, timeout_s=60, cache=True)
+        provider.chat("llama3.2", "Be helpful.", messages, timeout_s=30, cache=True)
+        provider.chat("llama3.2", "Be helpful.", messages, timeout_s=60, cache=True)
+        assert mock_post.call_count == 2
+
+    def test_native_chat_async_rejects_cache(self):
+        """Test that async overrides refuse cache=True instead of ignoring it."""
+        import asyncio
+        with pytest.raises(TypeError, match="cache=True"):
+            asyncio.run(OllamaProvider().chat_async("llama3.2", "Be helpful.", [], cache=True))
+
+    @patch('models.ollama_provider.requests.Session.post')
+    def test_chat_stream_splits_lines_across_chunks(self, mock_post):
+        """Test that stream lines split across network chunks are reassembled."""
+        response = mock_post.return_value.__enter__.return_value
+        response.iter_content.return_value = [
+            b'{"message": {"content": "Hel"}}\n{"message": {"con',
+            b'tent": "lo"}}\n\n',
+            b'{"done": true}',
+        ]
+
+        chunks = list(OllamaProvider().chat_stream("llama3.2", "Be helpful.", []))
+        assert chunks == ["Hel", "lo"]
+
+    def test_system_message_list_extends_for_long_histories(self):
+        """Test that a growing long history reuses the cached [system] + messages list."""
+        provider = OllamaProvider()
+        messages = [{"role": "user", "content": str(i)} for i in range(10)]
+
+        first = provider._with_system_message("Be helpful.", messages)
+        messages.append({"role": "assistant", "content": "ok"})
+        second = provider._with_system_message("Be helpful.", messages)
+
+        assert second is not first and second[:len(first)] == first
+        assert second[0] is first[0]
+        assert second == [{"role": "system", "content": "Be helpful."}] + messages
+        assert provider._with_system_message("Be brief.", messages)[0]["content"] == "Be brief."
+
+    @patch('models.ollama_provider.requests.Session.get')
     def test_health_check_success(self, mock_get):
         """Test health check when Ollama is available."""
         mock_response = Mock()
@@ -52,10 +143,220 @@ class TestOllamaProvider:
         provider = OllamaProvider()
         assert provider.health_check() is True
 
-    @patch('models.ollama_provider.requests.get')
+    @patch('models.ollama_provider.requests.Session.get')
     def test_health_check_failure(self, mock_get):
         """Test health check when Ollama is not available."""
         mock_get.side_effect = Exception("Connection failed")
 
         provider = OllamaProvider()
-        assert provider.health_check() is False
\ No newline at end of file
+        assert provider.health_check() is False
+
+    @patch('models.ollama_provider.requests.Session.post')
+    @patch('models.ollama_provider.requests.Session.get')
+    def test_health_check_cached_until_chat_failure(self, mock_get, mock_post):
+        """Test that health checks are cached and re-probed after a failed chat."""
+        mock_post.side_effect = Exception("Connection failed")
+        provider = OllamaProvider()
+
+        assert provider.health_check() is True
+        assert provider.health_check() is True
+        assert mock_get.call_count == 1
+
+        with pytest.raises(Exception):
+            provider.chat("llama3.2", "Be helpful.", [])
+        provider.health_check()
+        assert mock_get.call_count == 2
+
+class TestMessageConversion:
+    """Tests for provider message-format conversion caching."""
+
+    def test_anthropic_converts_only_new_messages(self):
+        from models.anthropic_provider import AnthropicProvider
+        provider = AnthropicProvider(api_key="test")
+        messages = [{"role": "user", "content": "Hi"}]
+
+        first = provider._convert_messages(messages)
+        messages.append({"role": "assistant", "content": "Hello!"})
+        second = provider._convert_messages(messages)
+
+        assert second[0] is first[0]
+        assert second == [
+            {"role": "user", "content": "Hi"},
+            {"role": "assistant", "content": "Hello!"},
+        ]
+
+    def test_callers_cannot_corrupt_the_cached_conversion(self):
+        from models.anthropic_provider import AnthropicProvider
+        provider = AnthropicProvider(api_key="test")
+        messages = [{"role": "user", "content": "Hi"}]
+
+        provider._convert_messages(messages).append({"role": "user", "content": "stray"})
+        messages.append({"role": "assistant", "content": "Hello!"})
+
+        assert [m["content"] for m in provider._convert_messages(messages)] == ["Hi", "Hello!"]
+
+    def test_anthropic_reconverts_after_in_place_edit(self):
+        from models.anthropic_provider import AnthropicProvider
+        provider = AnthropicProvider(api_key="test")
+        messages = [{"role": "user", "content": "Hi"}, {"role": "assistant", "content": "Hello!"}]
+        provider._convert_messages(messages)
+
+        messages[-1] = {"role": "assistant", "content": "Edited"}
+        assert provider._convert_messages(messages)[-1]["content"] == "Edited"
+
+        messages.clear()
+        messages.extend([{"role": "user", "content": "New"}] * 3)
+        assert [m["content"] for m in provider._convert_messages(messages)] == ["New"] * 3
+
+    def test_google_maps_roles_and_rebuilds_for_new_list(self):
+        from models.google_provider import GoogleProvider
+        provider = GoogleProvider(api_key="test")
+        provider._convert_messages([{"role": "user", "content": "old"}])
+
+        converted = provider._convert_messages([
+            {"role": "user", "content": "Hi"},
+            {"role": "assistant", "content": "Hello!"},
+        ])
+
+        assert converted == [
+            {"role": "user", "parts": [{"text": "Hi"}]},
+            {"role": "model", "parts": [{"text": "Hello!"}]},
+        ]
+
+    def test_google_reuses_prefix_from_a_new_list(self):
+        from models.google_provider import GoogleProvider
+        provider = GoogleProvider(api_key="test")
+        first_turn = [{"role": "user", "content": "Hi"}]
+        first = provider._convert_messages(first_turn)
+
+        second = provider._convert_messages(first_turn + [{"role": "assistant", "content": "Hello!"}])
+
+        assert second[0] is first[0]
+        assert second[-1] == {"role": "model", "parts": [{"text": "Hello!"}]}
+
+
+    def test_google_reuses_system_entry_for_same_prompt(self):
+        from models.google_provider import GoogleProvider
+        provider = GoogleProvider(api_key="test")
+
+        first = provider._build_contents("Be helpful.", [])
+        second = provider._build_contents("Be helpful.", [{"role": "user", "content": "Hi"}])
+
+        assert second[0] is first[0]
+        assert second[0] == {"role": "user", "parts": [{"text": "System: Be helpful."}]}
+        assert provider._build_contents("Be brief.", [])[0]["parts"][0]["text"] == "System: Be brief."
+
+
+class TestGoogleClient:
+    """Tests for Google client construction."""
+
+    @patch("google.genai.Client")
+    def test_older_sdk_without_httpx_client_option(self, mock_client):
+        """Test that SDKs whose HttpOptions lack httpx_client still get a client."""
+        from models.google_provider import GoogleProvider
+        old_options = Mock(model_fields={"timeout": None})
+        with patch("google.genai.types.HttpOptions", old_options):
+            GoogleProvider(api_key="test").client
+
+        old_options.assert_not_called()
+        mock_client.assert_called_once_with(api_key="test")
+
+
+class TestAnthropicStreamBatching:
+    """Tests for batching Anthropic stream deltas."""
+
+    @staticmethod
+    def _delta(text):
+        return Mock(type="content_block_delta", delta=Mock(text=text))
+
+    def test_batches_deltas_and_flushes_remainder(self):
+        from models.anthropic_provider import iter_text_batched
+        events = [self._delta("ab"), Mock(type="message_stop"), self._delta("cd"), self._delta("e")]
+
+        assert list(iter_text_batched(events, batch_chars=4)) == ["abcd", "e"]
+
+    def test_chat_stream_yields_each_delta_by_default(self):
+        from models.anthropic_provider import AnthropicProvider
+        provider = AnthropicProvider(api_key="test")
+        provider._client = Mock()
+        provider._client.messages.create.return_value = [self._delta("Hel"), self._delta("lo")]
+
+        assert list(provider.chat_stream("claude-3-5-haiku-20241022", "Be helpful.", [])) == ["Hel", "lo"]
+
+    def test_batch_size_one_yields_every_delta(self):
+        from models.anthropic_provider import iter_text_batched
+        long_delta = self._delta("a" * 64)
+        events = [long_delta, Mock(type="message_stop"), self._delta(""), self._delta("b")]
+
+        batches = list(iter_text_batched(events, batch_chars=1))
+        assert batches == ["a" * 64, "b"]
+        assert batches[0] is long_delta.delta.text
+
+
+class TestProviderForModelCache:
+    """Tests for the registry's model -> provider lookup cache."""
+
+    def test_second_lookup_skips_model_scan(self):
+        from models import ModelProviderRegistry
+
+        registry_under_test = ModelProviderRegistry()
+        registry_under_test.register(OllamaProvider)
+
+        with patch.object(OllamaProvider, "available_models", new_callable=PropertyMock) as models:
+            models.return_value = ["llama3.2:latest"]
+            first = registry_under_test.get_provider_for_model("llama3.2:latest")
+            second = registry_under_test.get_provider_for_model("llama3.2:latest")
+
+        assert first is second
+        assert models.call_count == 1
+
+    def test_lazy_registration_resolves_on_first_use(self):
+        from models import ModelProviderRegistry
+
+        registry_under_test = ModelProviderRegistry()
+        registry_under_test.register_lazy("Ollama", "models.ollama_provider:OllamaProvider")
+
+        assert registry_under_test._provider_classes["Ollama"] == "models.ollama_provider:OllamaProvider"
+        provider = registry_under_test.get_provider("Ollama")
+        assert isinstance(provider, OllamaProvider)
+        assert registry_under_test._provider_classes["Ollama"] is OllamaProvider
+
+
+class TestAsyncChat:
+    """Tests for async chat and fan-out."""
+
+    def test_ollama_chat_async_posts_to_shared_client(self):
+        import asyncio
+        from unittest.mock import AsyncMock
+
+        response = Mock()
+        response.json.return_value = {"message": {"content": "Hello!"}}
+        client = Mock()
+        client.post = AsyncMock(return_value=response)
+
+        with patch("models._http.get_async_client", return_value=client):
+            result = asyncio.run(OllamaProvider().chat_async(
+                "llama3.2", "Be helpful.", [{"role": "user", "content": "Hi"}]
+            ))
+
+        assert result == "Hello!"
+        payload = json.loads(client.post.call_args.kwargs["content"])
+        assert payload["messages"][0] == {"role": "system", "content": "Be helpful."}
+
+    def test_chat_many_async_returns_results_in_order(self):
+        import asyncio
+        from models import chat_many_async
+
+        ok = Mock()
+        ok.chat.return_value = "ok"
+        failing = Mock()
+        failing.chat.side_effect = RuntimeError("down")
+        # Use the base-class thread fallback for both fakes
+        from models import ModelProvider
+        ok.chat_async = lambda *a, **k: ModelProvider.chat_async(ok, *a, **k)
+        failing.chat_async = lambda *a, **k: ModelProvider.chat_async(failing, *a, **k)
+
+        results = asyncio.run(chat_many_async([(ok, "m1"), (failing, "m2")], "sys", []))
+
+        assert results[0] == "ok"
+        assert isinstance(results[1], RuntimeError)
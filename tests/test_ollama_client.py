@@ -1,3 +1,4 @@
+import json
 import pytest
 from unittest.mock import patch, Mock
 import requests
@@ -8,12 +9,20 @@ from ollama.client import (
     health_check,
     OllamaConnectionError,
     _base_url,
+    _get_session,
+    _reset_base_url_cache,
 )
 
 
 class TestBaseUrl:
     """Tests for _base_url helper."""
 
+    def setup_method(self):
+        _reset_base_url_cache()
+
+    def teardown_method(self):
+        _reset_base_url_cache()
+
     def test_default_url(self):
         with patch.dict("os.environ", {}, clear=True):
             assert _base_url() == "http://localhost:11434"
@@ -26,11 +35,26 @@ class TestBaseUrl:
         with patch.dict("os.environ", {"OLLAMA_URL": "http://custom:8080/"}):
             assert _base_url() == "http://custom:8080"
 
+    def test_url_is_cached_until_reset(self):
+        with patch.dict("os.environ", {"OLLAMA_URL": "http://first:8080"}):
+            assert _base_url() == "http://first:8080"
+        with patch.dict("os.environ", {"OLLAMA_URL": "http://second:8080"}):
+            assert _base_url() == "http://first:8080"
+            _reset_base_url_cache()
+            assert _base_url() == "http://second:8080"
+
+
+class TestSession:
+    """Tests for the shared HTTP session."""
+
+    def test_session_is_reused(self):
+        assert _get_session() is _get_session()
+
 
 class TestHealthCheck:
     """Tests for health_check function."""
 
-    @patch("ollama.client.requests.get")
+    @patch("ollama.client.requests.Session.get")
     def test_healthy_server_returns_true(self, mock_get):
         mock_get.return_value = Mock(status_code=200)
         mock_get.return_value.raise_for_status = Mock()
@@ -38,14 +62,14 @@ class TestHealthCheck:
         assert health_check() is True
         mock_get.assert_called_once()
 
-    @patch("ollama.client.requests.get")
+    @patch("ollama.client.requests.Session.get")
     def test_connection_error_raises(self, mock_get):
         mock_get.side_effect = requests.exceptions.ConnectionError()
         
         with pytest.raises(OllamaConnectionError, match="Cannot connect"):
             health_check()
 
-    @patch("ollama.client.requests.get")
+    @patch("ollama.client.requests.Session.get")
     def test_timeout_raises(self, mock_get):
         mock_get.side_effect = requests.exceptions.Timeout()
         
@@ -56,7 +80,7 @@ class TestHealthCheck:
 class TestChat:
     """Tests for chat function."""
 
-    @patch("ollama.client.requests.post")
+    @patch("ollama.client.requests.Session.post")
     def test_successful_chat_returns_content(self, mock_post):
         mock_response = Mock()
         mock_response.json.return_value = {
@@ -74,7 +98,7 @@ class TestChat:
         assert result == "Hello, adventurer!"
         mock_post.assert_called_once()
 
-    @patch("ollama.client.requests.post")
+    @patch("ollama.client.requests.Session.post")
     def test_chat_includes_system_prompt_in_messages(self, mock_post):
         mock_response = Mock()
         mock_response.json.return_value = {"message": {"content": "OK"}}
@@ -88,13 +112,13 @@ class TestChat:
         )
 
         call_args = mock_post.call_args
-        payload = call_args.kwargs["json"]
+        payload = json.loads(call_args.kwargs["data"])
         
         assert payload["messages"][0]["role"] == "system"
         assert payload["messages"][0]["content"] == "Be helpful."
         assert payload["messages"][1]["role"] == "user"
 
-    @patch("ollama.client.requests.post")
+    @patch("ollama.client.requests.Session.post")
     def test_connection_error_retries_and_raises(self, mock_post):
         mock_post.side_effect = requests.exceptions.ConnectionError()
 
@@ -110,7 +134,7 @@ class TestChat:
         # Should have retried
         assert mock_post.call_count == 2
 
-    @patch("ollama.client.requests.post")
+    @patch("ollama.client.requests.Session.post")
     def test_timeout_error_raises(self, mock_post):
         mock_post.side_effect = requests.exceptions.Timeout()
 
@@ -122,7 +146,7 @@ class TestChat:
                 max_retries=1,
             )
 
-    @patch("ollama.client.requests.post")
+    @patch("ollama.client.requests.Session.post")
     def test_retry_succeeds_on_second_attempt(self, mock_post):
         # First call fails, second succeeds
         mock_response = Mock()
@@ -149,14 +173,14 @@ class TestChat:
 class TestChatStream:
     """Tests for chat_stream function."""
 
-    @patch("ollama.client.requests.post")
+    @patch("ollama.client.requests.Session.post")
     def test_stream_yields_content_chunks(self, mock_post):
         # Simulate streaming response
         mock_response = Mock()
-        mock_response.iter_lines.return_value = [
-            b'{"message": {"content": "Hello"}, "done": false}',
-            b'{"message": {"content": " world"}, "done": false}',
-            b'{"message": {"content": "!"}, "done": true}',
+        mock_response.iter_content.return_value = [
+            b'{"message": {"content": "Hello"}, "done": false}\n',
+            b'{"message": {"content": " world"}, "done": false}\n',
+            b'{"message": {"content": "!"}, "done": true}\n',
         ]
         mock_response.raise_for_status = Mock()
         mock_response.__enter__ = Mock(return_value=mock_response)
@@ -171,7 +195,20 @@ class TestChatStream:
 
         assert chunks == ["Hello", " world", "!"]
 
-    @patch("ollama.client.requests.post")
+    @patch("ollama.client.requests.Session.post")
+    def test_stream_reassembles_lines_split_across_chunks(self, mock_post):
+        response = mock_post.return_value.__enter__.return_value
+        response.iter_content.return_value = [
+            b'{"message": {"content": "Hel"}}\n{"message": {"con',
+            b'tent": "lo"}}\n\n',
+            b'{"done": true}',
+        ]
+
+        chunks = list(chat_stream(model="llama3.2", system_prompt="Test", messages=[]))
+
+        assert chunks == ["Hel", "lo"]
+
+    @patch("ollama.client.requests.Session.post")
     def test_stream_connection_error_raises(self, mock_post):
         mock_post.side_effect = requests.exceptions.ConnectionError()
 
@@ -187,28 +224,35 @@ class TestPresets:
     """Tests for preset configurations."""
 
     def test_all_presets_have_valid_class(self):
-        from personas.presets import PRESETS, CLASS_FLAVOR
-        
-        for preset in PRESETS:
-            assert preset.cls in CLASS_FLAVOR, f"Preset {preset.key} has invalid class {preset.cls}"
+        from personas.presets import PRESETS
+        from personas.prompt_builder import check_presets
+
+        assert check_presets(PRESETS)["cls"] == [], "Presets with an invalid class"
 
     def test_all_presets_have_valid_spec(self):
-        from personas.presets import PRESETS, SPEC_BEHAVIOR
-        
-        for preset in PRESETS:
-            assert preset.spec in SPEC_BEHAVIOR, f"Preset {preset.key} has invalid spec {preset.spec}"
+        from personas.presets import PRESETS
+        from personas.prompt_builder import check_presets
+
+        assert check_presets(PRESETS)["spec"] == [], "Presets with an invalid spec"
 
     def test_all_presets_have_valid_mode(self):
         from personas.presets import PRESETS
-        
-        for preset in PRESETS:
-            assert preset.mode in ("Work", "Play"), f"Preset {preset.key} has invalid mode"
+        from personas.prompt_builder import check_presets
+
+        assert check_presets(PRESETS)["mode"] == [], "Presets with an invalid mode"
 
     def test_all_presets_have_valid_slider_values(self):
         from personas.presets import PRESETS
-        
-        for preset in PRESETS:
-            assert 1 <= preset.verbosity <= 10, f"Preset {preset.key} has invalid verbosity"
-            assert 0 <= preset.humor <= 10, f"Preset {preset.key} has invalid humor"
-            assert 1 <= preset.assertiveness <= 10, f"Preset {preset.key} has invalid assertiveness"
-            assert 0 <= preset.creativity <= 10, f"Preset {preset.key} has invalid creativity"
+        from personas.prompt_builder import check_presets
+
+        assert check_presets(PRESETS)["sliders"] == [], "Presets with out-of-range slider values"
+
+    def test_check_presets_reports_failing_keys(self):
+        from dataclasses import replace
+        from personas.presets import PRESETS
+        from personas.prompt_builder import check_presets
+
+        bad = replace(PRESETS[0], key="bad", cls="Necromancer", mode="Sleep", humor=11)
+        failures = check_presets([PRESETS[0], bad])
+
+        assert failures == {"cls": ["bad"], "spec": [], "mode": ["bad"], "sliders": ["bad"]}
@@ -1,384 +1,173 @@
+import re
 import pytest
+from dataclasses import FrozenInstanceError, replace
 from personas.prompt_builder import PersonaConfig, build_system_prompt, PersonaValidationError
 
+# A valid baseline config; tests override only the fields they exercise
+BASE_KWARGS = dict(
+    version_codename="Test",
+    cls="Mage",
+    spec="Teacher",
+    mode="Play",
+    verbosity=5,
+    humor=4,
+    assertiveness=6,
+    creativity=5,
+    formality=5,
+    empathy=5,
+    technical_level=5,
+    patience=5,
+)
+
+
+# Error-message patterns for pytest.raises(match=...), compiled once for the module
+_MSG = {
+    "verbosity": re.compile(r"verbosity must be between 1 and 10"),
+    "creativity": re.compile(r"creativity must be between 0 and 10"),
+    "patience": re.compile(r"patience must be between 1 and 10"),
+    "version_codename": re.compile(r"version_codename cannot be empty"),
+    "class": re.compile(r"Unknown class"),
+    "spec": re.compile(r"Unknown spec"),
+    "mode": re.compile(r"mode must be"),
+    "not_found": re.compile(r"Persona file not found"),
+    "bad_format": re.compile(r"Invalid persona file format"),
+}
+
+
+def make_cfg(**overrides) -> PersonaConfig:
+    """Build a PersonaConfig from BASE_KWARGS with the given fields replaced."""
+    return PersonaConfig(**{**BASE_KWARGS, **overrides})
+
+
+@pytest.fixture(scope="module")
+def rendered():
+    """Render each distinct set of overrides once for the whole module."""
+    cache = {}
+
+    def render(**overrides) -> str:
+        key = tuple(sorted(overrides.items()))
+        if key not in cache:
+            cache[key] = build_system_prompt(make_cfg(**overrides))
+        return cache[key]
+
+    return render
+
 
 class TestPersonaConfig:
     """Tests for PersonaConfig validation."""
 
     def test_valid_config_creates_successfully(self):
-        cfg = PersonaConfig(
-            version_codename="ChatGPT 26.2: Redwood",
-            cls="Mage",
-            spec="Teacher",
-            mode="Play",
-            verbosity=6,
-            humor=4,
-            assertiveness=6,
-            creativity=5,
-            formality=5,
-            empathy=5,
-            technical_level=5,
-            patience=5)
+        cfg = make_cfg(verbosity=6)
         assert cfg.cls == "Mage"
         assert cfg.verbosity == 6
 
     def test_config_with_avatar_creates_successfully(self):
-        cfg = PersonaConfig(
-            version_codename="ChatGPT 26.2: Redwood",
-            cls="Mage",
-            spec="Teacher",
-            mode="Play",
-            verbosity=6,
-            humor=4,
-            assertiveness=6,
-            creativity=5,
-            formality=5,
-            empathy=5,
-            technical_level=5,
-            patience=5,
-            avatar="🧙‍♂️")
+        cfg = make_cfg(avatar="🧙‍♂️")
         assert cfg.avatar == "🧙‍♂️"
 
-    def test_verbosity_below_minimum_raises(self):
-        with pytest.raises(PersonaValidationError, match="verbosity must be between 1 and 10"):
-            PersonaConfig(
-                version_codename="Test",
-                cls="Mage",
-                spec="Teacher",
-                mode="Play",
-                verbosity=0,  # Invalid: min is 1
-                humor=4,
-                assertiveness=6,
-                creativity=5,
-                formality=5,
-                empathy=5,
-                technical_level=5,
-                patience=5,
-            )
-    def test_verbosity_above_maximum_raises(self):
-        with pytest.raises(PersonaValidationError, match="verbosity must be between 1 and 10"):
-            PersonaConfig(
-                version_codename="Test",
-                cls="Mage",
-                spec="Teacher",
-                mode="Play",
-                verbosity=11,  # Invalid: max is 10
-                humor=4,
-                assertiveness=6,
-                creativity=5,
-                formality=5,
-                empathy=5,
-                technical_level=5,
-                patience=5,
-            )
-    def test_humor_at_zero_is_valid(self):
-        cfg = PersonaConfig(
-            version_codename="Test",
-            cls="Mage",
-            spec="Teacher",
-            mode="Play",
-            verbosity=5,
-            humor=0,  # Valid: min is 0
-            assertiveness=5,
-            creativity=5,
-            formality=5,
-            empathy=5,
-            technical_level=5,
-            patience=5)
-        assert cfg.humor == 0
-
-    def test_creativity_above_maximum_raises(self):
-        with pytest.raises(PersonaValidationError, match="creativity must be between 0 and 10"):
-            PersonaConfig(
-                version_codename="Test",
-                cls="Mage",
-                spec="Teacher",
-                mode="Play",
-                verbosity=5,
-                humor=4,
-                assertiveness=6,
-                creativity=15,  # Invalid
-                formality=5,
-                empathy=5,
-                technical_level=5,
-                patience=5)
+    @pytest.mark.parametrize("field,value,error", [
+        ("verbosity", 0, _MSG["verbosity"]),  # min is 1
+        ("verbosity", 11, _MSG["verbosity"]),  # max is 10
+        ("verbosity", 1, None),
+        ("humor", 0, None),  # min is 0
+        ("creativity", 15, _MSG["creativity"]),
+        ("patience", 0, _MSG["patience"]),
+        ("technical_level", 10, None),
+    ])
+    def test_slider_bounds(self, field, value, error):
+        if error is None:
+            assert getattr(make_cfg(**{field: value}), field) == value
+        else:
+            with pytest.raises(PersonaValidationError, match=error):
+                make_cfg(**{field: value})
+
+    def test_slider_accepts_int_subclasses_but_not_bool(self):
+        from enum import IntEnum
+        Level = IntEnum("Level", {"HIGH": 8})
+        assert make_cfg(humor=Level.HIGH).humor == 8
+        with pytest.raises(PersonaValidationError, match="humor must be an integer, got bool"):
+            make_cfg(humor=True)
+
     def test_empty_version_codename_raises(self):
-        with pytest.raises(PersonaValidationError, match="version_codename cannot be empty"):
-            PersonaConfig(
-                version_codename="",
-                cls="Mage",
-                spec="Teacher",
-                mode="Play",
-                verbosity=5,
-                humor=4,
-                assertiveness=6,
-                creativity=5,
-                formality=5,
-                empathy=5,
-                technical_level=5,
-                patience=5)
+        with pytest.raises(PersonaValidationError, match=_MSG["version_codename"]):
+            make_cfg(version_codename="")
+
     def test_whitespace_only_version_codename_raises(self):
-        with pytest.raises(PersonaValidationError, match="version_codename cannot be empty"):
-            PersonaConfig(
-                version_codename="   ",
-                cls="Mage",
-                spec="Teacher",
-                mode="Play",
-                verbosity=5,
-                humor=4,
-                assertiveness=6,
-                creativity=5,
-
-            formality=5,
-            empathy=5,
-            technical_level=5,
-            patience=5)
+        with pytest.raises(PersonaValidationError, match=_MSG["version_codename"]):
+            make_cfg(version_codename="   ")
+
+
 class TestBuildSystemPrompt:
     """Tests for build_system_prompt function."""
 
-    def test_build_system_prompt_contains_badge(self):
-        cfg = PersonaConfig(
-            version_codename="ChatGPT 26.2: Redwood",
-            cls="Mage",
-            spec="Teacher",
-            mode="Play",
-            verbosity=6,
-            humor=4,
-            assertiveness=6,
-            creativity=5,
-
-            formality=5,
-            empathy=5,
-            technical_level=5,
-            patience=5)
-        s = build_system_prompt(cfg)
-        assert "Persona Badge:" in s
-        assert "Class=Mage" in s
-        assert "Spec=Teacher" in s
-
-    def test_build_system_prompt_with_name(self):
-        cfg = PersonaConfig(
-            version_codename="ChatGPT 26.2: Redwood",
-            cls="Mage",
-            spec="Teacher",
-            mode="Play",
-            verbosity=6,
-            humor=4,
-            assertiveness=6,
-            creativity=5,
-            formality=5,
-            empathy=5,
-            technical_level=5,
-            patience=5,
-            name="Archmage Lyra",
-        )
-        s = build_system_prompt(cfg)
-        assert "Your name is Archmage Lyra" in s
-        assert "\"Archmage Lyra\"" in s
-
-    def test_build_system_prompt_without_name(self):
-        cfg = PersonaConfig(
-            version_codename="ChatGPT 26.2: Redwood",
-            cls="Mage",
-            spec="Teacher",
-            mode="Play",
-            verbosity=6,
-            humor=4,
-            assertiveness=6,
-            creativity=5,
-            formality=5,
-            empathy=5,
-            technical_level=5,
-            patience=5,
-            name="",
-        )
-        s = build_system_prompt(cfg)
+    _SLIDERS = dict(cls="Paladin", spec="Accuracy", mode="Work",
+                    verbosity=8, humor=2, assertiveness=7, creativity=3)
+
+    @pytest.mark.parametrize("overrides,expected", [
+        ({}, "Persona Badge:"),
+        ({}, "Class=Mage"),
+        ({}, "Spec=Teacher"),
+        ({"name": "Archmage Lyra"}, "Your name is Archmage Lyra"),
+        ({"name": "Archmage Lyra"}, "\"Archmage Lyra\""),
+        (_SLIDERS, "Verbosity: 8/10"),
+        (_SLIDERS, "Humor: 2/10"),
+        (_SLIDERS, "Assertiveness: 7/10"),
+        (_SLIDERS, "Creativity: 3/10"),
+        ({"cls": "Rogue", "spec": "Speed", "mode": "Work"}, "Work Mode: prioritize clarity and correctness"),
+        ({"cls": "Bard", "spec": "Builder", "mode": "Play"}, "Play Mode: allow stronger flavor"),
+        ({"cls": "Warlock", "spec": "Critic", "mode": "Work"}, "Analytical and thorough"),  # Warlock flavor
+        ({"cls": "Hunter", "spec": "Debugger", "mode": "Work"}, "Systematic troubleshooter"),  # Debugger behavior
+        ({}, "Do not claim sentience"),  # safety rails
+        ({}, "financial/legal/medical advice"),
+    ])
+    def test_prompt_contains(self, overrides, expected, rendered):
+        assert expected in rendered(**overrides)
+
+    def test_build_system_prompt_without_name(self, rendered):
+        s = rendered(name="")
         assert "Your name is" not in s
 
-    def test_build_system_prompt_contains_sliders(self):
-        cfg = PersonaConfig(
-            version_codename="Test",
-            cls="Paladin",
-            spec="Accuracy",
-            mode="Work",
-            verbosity=8,
-            humor=2,
-            assertiveness=7,
-            creativity=3,
-
-            formality=5,
-            empathy=5,
-            technical_level=5,
-            patience=5)
-        s = build_system_prompt(cfg)
-        assert "Verbosity: 8/10" in s
-        assert "Humor: 2/10" in s
-        assert "Assertiveness: 7/10" in s
-        assert "Creativity: 3/10" in s
-
-    def test_work_mode_rules_included(self):
-        cfg = PersonaConfig(
-            version_codename="Test",
-            cls="Rogue",
-            spec="Speed",
-            mode="Work",
-            verbosity=5,
-            humor=2,
-            assertiveness=6,
-            creativity=3,
-
-            formality=5,
-            empathy=5,
-            technical_level=5,
-            patience=5)
-        s = build_system_prompt(cfg)
-        assert "Work Mode: prioritize clarity and correctness" in s
-
-    def test_play_mode_rules_included(self):
-        cfg = PersonaConfig(
-            version_codename="Test",
-            cls="Bard",
-            spec="Builder",
-            mode="Play",
-            verbosity=5,
-            humor=6,
-            assertiveness=6,
-            creativity=7,
-
-            formality=5,
-            empathy=5,
-            technical_level=5,
-            patience=5)
-        s = build_system_prompt(cfg)
-        assert "Play Mode: allow stronger flavor" in s
-
     def test_unknown_class_raises(self):
-        cfg = PersonaConfig(
-            version_codename="X",
-            cls="Necromancer",
-            spec="Teacher",
-            mode="Play",
-            verbosity=6,
-            humor=4,
-            assertiveness=6,
-            creativity=5,
-
-            formality=5,
-            empathy=5,
-            technical_level=5,
-            patience=5)
-        with pytest.raises(ValueError, match="Unknown class"):
+        cfg = make_cfg(cls="Necromancer")
+        with pytest.raises(ValueError, match=_MSG["class"]):
             build_system_prompt(cfg)
+
     def test_unknown_spec_raises(self):
-        cfg = PersonaConfig(
-            version_codename="X",
-            cls="Mage",
-            spec="Healer",
-            mode="Play",
-            verbosity=6,
-            humor=4,
-            assertiveness=6,
-            creativity=5,
-
-            formality=5,
-            empathy=5,
-            technical_level=5,
-            patience=5)
-        with pytest.raises(ValueError, match="Unknown spec"):
+        cfg = make_cfg(spec="Healer")
+        with pytest.raises(ValueError, match=_MSG["spec"]):
             build_system_prompt(cfg)
+
     def test_invalid_mode_raises(self):
-        cfg = PersonaConfig(
-            version_codename="X",
-            cls="Mage",
-            spec="Teacher",
-            mode="Chaos",  # Invalid
-            verbosity=6,
-            humor=4,
-            assertiveness=6,
-            creativity=5,
-            formality=5,
-            empathy=5,
-            technical_level=5,
-            patience=5,
-        )
-        with pytest.raises(ValueError, match="mode must be"):
+        cfg = make_cfg(mode="Chaos")  # Invalid
+        with pytest.raises(ValueError, match=_MSG["mode"]):
             build_system_prompt(cfg)
-    def test_class_flavor_included(self):
-        cfg = PersonaConfig(
-            version_codename="Test",
-            cls="Warlock",
-            spec="Critic",
-            mode="Work",
-            verbosity=5,
-            humor=2,
-            assertiveness=8,
-            creativity=3,
-
-            formality=5,
-            empathy=5,
-            technical_level=5,
-            patience=5)
-        s = build_system_prompt(cfg)
-        assert "Analytical and thorough" in s  # Warlock flavor
-
-    def test_spec_behavior_included(self):
-        cfg = PersonaConfig(
-            version_codename="Test",
-            cls="Hunter",
-            spec="Debugger",
-            mode="Work",
-            verbosity=5,
-            humor=1,
-            assertiveness=6,
-            creativity=2,
-
-            formality=5,
-            empathy=5,
-            technical_level=5,
-            patience=5)
-        s = build_system_prompt(cfg)
-        assert "Systematic troubleshooter" in s  # Debugger behavior
-
-    def test_safety_rails_included(self):
-        cfg = PersonaConfig(
-            version_codename="Test",
-            cls="Mage",
-            spec="Teacher",
-            mode="Play",
-            verbosity=5,
-            humor=4,
-            assertiveness=6,
-            creativity=5,
-
-            formality=5,
-            empathy=5,
-            technical_level=5,
-            patience=5)
-        s = build_system_prompt(cfg)
-        assert "Do not claim sentience" in s
-        assert "financial/legal/medical advice" in s
+
+    def test_prompt_cache_tracks_field_changes(self):
+        cfg = make_cfg()
+        first = build_system_prompt(cfg)
+        assert build_system_prompt(cfg) is first
+
+        assert "Humor: 9/10" in build_system_prompt(replace(cfg, humor=9))
+
+    def test_config_is_immutable(self):
+        cfg = make_cfg()
+        with pytest.raises(FrozenInstanceError):
+            cfg.humor = 9
+
+    def test_equal_configs_hash_equal(self):
+        cfg = make_cfg()
+        same = replace(cfg)
+
+        assert {cfg: "prompt"}[same] == "prompt"
+        assert hash(cfg) == hash(same)
+        assert "_hash" not in cfg.to_dict()
 
 
 class TestPersonaSaveLoad:
     """Tests for persona save/load functionality."""
 
     def test_to_dict_converts_config_to_dict(self):
-        cfg = PersonaConfig(
-            version_codename="Test Version",
-            cls="Mage",
-            spec="Teacher",
-            mode="Play",
-            verbosity=6,
-            humor=4,
-            assertiveness=6,
-            creativity=5,
-            formality=5,
-            empathy=5,
-            technical_level=5,
-            patience=5,
-            name="Test Persona",
-            avatar="🧙‍♂️",
-        )
+        cfg = make_cfg(version_codename="Test Version", name="Test Persona", avatar="🧙‍♂️")
         data = cfg.to_dict()
         assert data["version_codename"] == "Test Version"
         assert data["cls"] == "Mage"
@@ -386,18 +175,8 @@ class TestPersonaSaveLoad:
 
     def test_from_dict_creates_config_from_dict(self):
         data = {
+            **BASE_KWARGS,
             "version_codename": "Test Version",
-            "cls": "Mage",
-            "spec": "Teacher",
-            "mode": "Play",
-            "verbosity": 6,
-            "humor": 4,
-            "assertiveness": 6,
-            "creativity": 5,
-            "formality": 5,
-            "empathy": 5,
-            "technical_level": 5,
-            "patience": 5,
             "name": "Test Persona",
             "avatar": "🧙‍♂️",
         }
@@ -406,36 +185,46 @@ class TestPersonaSaveLoad:
         assert cfg.cls == "Mage"
         assert cfg.avatar == "🧙‍♂️"
 
-    def test_save_and_load_roundtrip(self, tmp_path):
-        cfg = PersonaConfig(
-            version_codename="Test Version",
-            cls="Mage",
-            spec="Teacher",
-            mode="Play",
-            verbosity=6,
-            humor=4,
-            assertiveness=6,
-            creativity=5,
-            formality=5,
-            empathy=5,
-            technical_level=5,
-            patience=5,
-            name="Test Persona",
-            avatar="🧙‍♂️",
-        )
-        filepath = tmp_path / "test_persona.json"
+    def test_json_roundtrip(self):
+        cfg = make_cfg(version_codename="Test Version", name="Test Persona", avatar="🧙‍♂️")
+        loaded_cfg = PersonaConfig.from_json(cfg.to_json())
+        assert loaded_cfg.to_dict() == cfg.to_dict()
+
+    def test_save_and_load_file_roundtrip(self, tmp_path):
+        cfg = make_cfg(version_codename="Test Version", name="Test Persona", avatar="🧙‍♂️")
+        filepath = tmp_path / "personas" / "test_persona.json"
         cfg.save_to_file(str(filepath))
-        loaded_cfg = PersonaConfig.load_from_file(str(filepath))
-        assert loaded_cfg.version_codename == cfg.version_codename
-        assert loaded_cfg.cls == cfg.cls
-        assert loaded_cfg.avatar == cfg.avatar
-        assert loaded_cfg.name == cfg.name
+
+        assert filepath.read_text(encoding="utf-8") == cfg.to_json()
+        assert PersonaConfig.load_from_file(str(filepath)) == cfg
+
+    def test_save_recreates_directory_deleted_between_saves(self, tmp_path):
+        import shutil
+        cfg = make_cfg(version_codename="Test Version")
+        directory = tmp_path / "personas"
+        cfg.save_to_file(str(directory / "first.json"))
+
+        shutil.rmtree(directory)
+        cfg.save_to_file(str(directory / "second.json"))
+        assert PersonaConfig.load_from_file(str(directory / "second.json")) == cfg
+
+    def test_save_pretty_writes_indented_json(self, tmp_path):
+        cfg = make_cfg(version_codename="Test Version")
+        compact = tmp_path / "compact.json"
+        pretty = tmp_path / "pretty.json"
+        cfg.save_to_file(str(compact))
+        cfg.save_to_file(str(pretty), pretty=True)
+
+        assert "\n" not in compact.read_text(encoding="utf-8")
+        assert '\n  "cls": "Mage"' in pretty.read_text(encoding="utf-8")
+        assert PersonaConfig.load_from_file(str(pretty)) == cfg
 
     def test_load_from_nonexistent_file_raises_error(self):
-        with pytest.raises(PersonaValidationError, match="Persona file not found"):
+        with pytest.raises(PersonaValidationError, match=_MSG["not_found"]):
             PersonaConfig.load_from_file("nonexistent_file.json")
+
     def test_load_from_invalid_json_raises_error(self, tmp_path):
         filepath = tmp_path / "invalid.json"
         filepath.write_text("invalid json content")
-        with pytest.raises(PersonaValidationError, match="Invalid persona file format"):
-            PersonaConfig.load_from_file(str(filepath))
\ No newline at end of file
+        with pytest.raises(PersonaValidationError, match=_MSG["bad_format"]):
+            PersonaConfig.load_from_file(str(filepath))
@@ -0,0 +1,133 @@
+"""
+Tests for the theming system.
+"""
+import pytest
+from dataclasses import FrozenInstanceError
+from unittest.mock import Mock, patch
+from themes import ThemeManager, CLASS_THEMES, _minify
+
+
+class TestThemeColors:
+    """Tests for the ThemeColors dataclass."""
+
+    def test_class_names_are_shared_with_presets(self):
+        from personas.presets import CLASS_FLAVOR
+        flavor_names = {name: name for name in CLASS_FLAVOR}
+        shared = [name for name in CLASS_THEMES if name in flavor_names]
+        assert shared and all(flavor_names[name] is name for name in shared)
+
+    def test_colors_are_immutable_and_hashable(self):
+        colors = CLASS_THEMES["Mage"]
+        with pytest.raises(FrozenInstanceError):
+            colors.primary = "#000000"
+        assert {colors: "Mage"}[CLASS_THEMES["Mage"]] == "Mage"
+
+
+class TestThemeManager:
+    """Tests for theme lookup."""
+
+    def test_themes_are_built_on_first_use(self):
+        manager = ThemeManager()
+        assert manager._themes == {}
+
+        dark = manager.get_theme("dark")
+        assert manager.get_theme("dark") is dark
+        assert list(manager._themes) == ["dark"]
+
+    def test_light_and_dark_share_fonts_and_spacing(self):
+        manager = ThemeManager()
+        light, dark = manager.get_theme("light"), manager.get_theme("dark")
+        assert light.fonts is dark.fonts
+        assert light.spacing is dark.spacing
+        assert light.shadows != dark.shadows
+
+    def test_unknown_theme_falls_back_to_light(self):
+        manager = ThemeManager()
+        assert manager.get_theme("neon") is manager.get_theme("light")
+
+
+class TestApplyThemeCss:
+    """Tests for ThemeManager.apply_theme_css."""
+
+    @patch("themes.st.markdown")
+    def test_css_is_built_once_per_theme(self, mock_markdown):
+        """Test that repeated calls reuse the rendered CSS string."""
+        manager = ThemeManager()
+        theme = manager.get_theme("dark")
+
+        manager.apply_theme_css(theme)
+        manager.apply_theme_css(theme)
+
+        first, second = (call.args[0] for call in mock_markdown.call_args_list)
+        assert first is second
+        assert "--primary-color:#4dabf7;" in first
+        assert ".stButton" not in first
+
+    @patch("themes.st.markdown")
+    def test_base_css_holds_the_static_rules(self, mock_markdown):
+        """Test that the theme-independent rules are emitted by apply_base_css."""
+        ThemeManager().apply_base_css()
+
+        css = mock_markdown.call_args.args[0]
+        assert ".stButton>button{" in css and "--primary-color:" not in css
+        assert ".provider-badge.deepseek{" in css
+
+    def test_minify_strips_comments_and_whitespace(self):
+        css = """
+        /* Buttons */
+        .stButton > button:hover {
+            border: 1px solid var(--border-color);
+        }
+        """
+        assert _minify(css) == ".stButton>button:hover{border:1px solid var(--border-color);}"
+
+    @patch("themes.st.markdown")
+    def test_builtin_combinations_are_prerendered(self, mock_markdown):
+        """Test that built-in theme/class pairs need no rendering at call time."""
+        manager = ThemeManager()
+        themes = [manager.get_theme("light"), manager.get_theme("dark")]
+        with patch("themes._render_css") as mock_render:
+            for theme in themes:
+                manager.apply_theme_css(theme)
+                manager.apply_theme_css(theme, CLASS_THEMES["Druid"])
+
+        mock_render.assert_not_called()
+        assert mock_markdown.call_count == 4
+
+    @patch("themes.st.markdown")
+    def test_container_receives_the_css(self, mock_markdown):
+        """Test that CSS goes to the given placeholder instead of a new element."""
+        manager = ThemeManager()
+        slot = Mock()
+        theme = manager.get_theme("light")
+
+        manager.apply_theme_css(theme, container=slot)
+        manager.apply_theme_css(theme, CLASS_THEMES["Rogue"], container=slot)
+
+        mock_markdown.assert_not_called()
+        assert slot.markdown.call_count == 2
+        assert "--primary-color:#16a34a;" in slot.markdown.call_args.args[0]
+
+    @patch("themes.st.markdown")
+    def test_class_colors_override_theme_colors(self, mock_markdown):
+        """Test that a class theme replaces the base theme's colors."""
+        manager = ThemeManager()
+        manager.apply_theme_css(manager.get_theme("light"), CLASS_THEMES["Warrior"])
+
+        assert "--primary-color:#dc2626;" in mock_markdown.call_args.args[0]
+
+
+class TestBadges:
+    """Tests for persona and provider badge helpers."""
+
+    def test_persona_badge_is_reused(self):
+        manager = ThemeManager()
+        first = manager.create_persona_badge("Lyra", "Mage", "Teacher", "Work", "🧙")
+        assert manager.create_persona_badge("Lyra", "Mage", "Teacher", "Work", "🧙") is first
+        assert "🧙 Lyra | Mage / Teacher | Work" in first
+
+    def test_provider_badge_class(self):
+        manager = ThemeManager()
+        assert manager.get_provider_badge_class("OpenAI") == "provider-badge openai"
+        assert manager.get_provider_badge_class("OpenAI") is manager.get_provider_badge_class("openai")
+        assert manager.get_provider_badge_class("Mistral") == "provider-badge mistral"
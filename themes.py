@@ -2,13 +2,17 @@
 Enhanced styling and theming system for the persona chat app.
 """
 from __future__ import annotations
+import re
+import sys
 import streamlit as st
-from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
+from typing import Dict, Any, Optional, Tuple
+from dataclasses import dataclass, fields
 from personas.presets import CLASS_FLAVOR
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ThemeColors:
     """Color scheme for a theme."""
     primary: str
@@ -25,7 +29,12 @@ class ThemeColors:
     info: str
 
 
-@dataclass
+# All ThemeColors values as a tuple in field order, read in one call
+# (dataclasses.astuple would deep-copy every field)
+_color_values = attrgetter(*(f.name for f in fields(ThemeColors)))
+
+
+@dataclass(frozen=True, slots=True)
 class Theme:
     """Complete theme configuration."""
     name: str
@@ -67,365 +76,237 @@ DARK_THEME = ThemeColors(
     info="#339af0"
 )
 
-# WoW Class-specific themes
-CLASS_THEMES = {
-    "Mage": ThemeColors(
-        primary="#3b82f6",  # Blue
-        secondary="#1e40af",
-        accent="#60a5fa",
-        background="#ffffff",
-        surface="#eff6ff",
-        text="#1e3a8a",
-        text_secondary="#3b82f6",
-        border="#93c5fd",
-        success="#10b981",
-        warning="#f59e0b",
-        error="#ef4444",
-        info="#3b82f6"
+# WoW class color schemes, one value per ThemeColors field in declaration order:
+# primary, secondary, accent, background, surface, text,
+# text_secondary, border, success, warning, error, info
+_CLASS_COLOR_TUPLES = {
+    "Mage": (  # Blue
+        "#3b82f6", "#1e40af", "#60a5fa", "#ffffff", "#eff6ff", "#1e3a8a",
+        "#3b82f6", "#93c5fd", "#10b981", "#f59e0b", "#ef4444", "#3b82f6",
     ),
-    "Warrior": ThemeColors(
-        primary="#dc2626",  # Red
-        secondary="#991b1b",
-        accent="#f87171",
-        background="#ffffff",
-        surface="#fef2f2",
-        text="#7f1d1d",
-        text_secondary="#dc2626",
-        border="#fca5a5",
-        success="#10b981",
-        warning="#f59e0b",
-        error="#ef4444",
-        info="#dc2626"
+    "Warrior": (  # Red
+        "#dc2626", "#991b1b", "#f87171", "#ffffff", "#fef2f2", "#7f1d1d",
+        "#dc2626", "#fca5a5", "#10b981", "#f59e0b", "#ef4444", "#dc2626",
     ),
-    "Paladin": ThemeColors(
-        primary="#eab308",  # Gold
-        secondary="#a16207",
-        accent="#facc15",
-        background="#ffffff",
-        surface="#fefce8",
-        text="#713f12",
-        text_secondary="#eab308",
-        border="#fde047",
-        success="#10b981",
-        warning="#f59e0b",
-        error="#ef4444",
-        info="#eab308"
+    "Paladin": (  # Gold
+        "#eab308", "#a16207", "#facc15", "#ffffff", "#fefce8", "#713f12",
+        "#eab308", "#fde047", "#10b981", "#f59e0b", "#ef4444", "#eab308",
     ),
-    "Rogue": ThemeColors(
-        primary="#16a34a",  # Green
-        secondary="#14532d",
-        accent="#4ade80",
-        background="#ffffff",
-        surface="#f0fdf4",
-        text="#14532d",
-        text_secondary="#16a34a",
-        border="#86efac",
-        success="#10b981",
-        warning="#f59e0b",
-        error="#ef4444",
-        info="#16a34a"
+    "Rogue": (  # Green
+        "#16a34a", "#14532d", "#4ade80", "#ffffff", "#f0fdf4", "#14532d",
+        "#16a34a", "#86efac", "#10b981", "#f59e0b", "#ef4444", "#16a34a",
     ),
-    "Priest": ThemeColors(
-        primary="#7c3aed",  # Purple
-        secondary="#581c87",
-        accent="#a78bfa",
-        background="#ffffff",
-        surface="#faf5ff",
-        text="#581c87",
-        text_secondary="#7c3aed",
-        border="#c4b5fd",
-        success="#10b981",
-        warning="#f59e0b",
-        error="#ef4444",
-        info="#7c3aed"
+    "Priest": (  # Purple
+        "#7c3aed", "#581c87", "#a78bfa", "#ffffff", "#faf5ff", "#581c87",
+        "#7c3aed", "#c4b5fd", "#10b981", "#f59e0b", "#ef4444", "#7c3aed",
     ),
-    "Shaman": ThemeColors(
-        primary="#0891b2",  # Teal
-        secondary="#164e63",
-        accent="#22d3ee",
-        background="#ffffff",
-        surface="#ecfeff",
-        text="#164e63",
-        text_secondary="#0891b2",
-        border="#67e8f9",
-        success="#10b981",
-        warning="#f59e0b",
-        error="#ef4444",
-        info="#0891b2"
+    "Shaman": (  # Teal
+        "#0891b2", "#164e63", "#22d3ee", "#ffffff", "#ecfeff", "#164e63",
+        "#0891b2", "#67e8f9", "#10b981", "#f59e0b", "#ef4444", "#0891b2",
     ),
-    "Druid": ThemeColors(
-        primary="#15803d",  # Forest Green
-        secondary="#14532d",
-        accent="#22c55e",
-        background="#ffffff",
-        surface="#f0fdf4",
-        text="#14532d",
-        text_secondary="#15803d",
-        border="#86efac",
-        success="#10b981",
-        warning="#f59e0b",
-        error="#ef4444",
-        info="#15803d"
+    "Druid": (  # Forest Green
+        "#15803d", "#14532d", "#22c55e", "#ffffff", "#f0fdf4", "#14532d",
+        "#15803d", "#86efac", "#10b981", "#f59e0b", "#ef4444", "#15803d",
     ),
-    "Hunter": ThemeColors(
-        primary="#a16207",  # Brown
-        secondary="#78350f",
-        accent="#d97706",
-        background="#ffffff",
-        surface="#fffbeb",
-        text="#78350f",
-        text_secondary="#a16207",
-        border="#fcd34d",
-        success="#10b981",
-        warning="#f59e0b",
-        error="#ef4444",
-        info="#a16207"
+    "Hunter": (  # Brown
+        "#a16207", "#78350f", "#d97706", "#ffffff", "#fffbeb", "#78350f",
+        "#a16207", "#fcd34d", "#10b981", "#f59e0b", "#ef4444", "#a16207",
     ),
-    "Warlock": ThemeColors(
-        primary="#7c2d12",  # Dark Red
-        secondary="#450a0a",
-        accent="#dc2626",
-        background="#ffffff",
-        surface="#fef2f2",
-        text="#450a0a",
-        text_secondary="#7c2d12",
-        border="#fca5a5",
-        success="#10b981",
-        warning="#f59e0b",
-        error="#ef4444",
-        info="#7c2d12"
+    "Warlock": (  # Dark Red
+        "#7c2d12", "#450a0a", "#dc2626", "#ffffff", "#fef2f2", "#450a0a",
+        "#7c2d12", "#fca5a5", "#10b981", "#f59e0b", "#ef4444", "#7c2d12",
+    ),
+    "Death Knight": (  # Dark Gray
+        "#1f2937", "#111827", "#374151", "#ffffff", "#f9fafb", "#111827",
+        "#1f2937", "#d1d5db", "#10b981", "#f59e0b", "#ef4444", "#1f2937",
     ),
-    "Death Knight": ThemeColors(
-        primary="#1f2937",  # Dark Gray
-        secondary="#111827",
-        accent="#374151",
-        background="#ffffff",
-        surface="#f9fafb",
-        text="#111827",
-        text_secondary="#1f2937",
-        border="#d1d5db",
-        success="#10b981",
-        warning="#f59e0b",
-        error="#ef4444",
-        info="#1f2937"
-    )
 }
 
+# WoW Class-specific themes; names are interned so lookups with the
+# interned names from personas.presets match on identity
+CLASS_THEMES: Dict[str, ThemeColors] = {
+    sys.intern(name): ThemeColors(*colors) for name, colors in _CLASS_COLOR_TUPLES.items()
+}
 
-class ThemeManager:
-    """Manages application theming and styling."""
-
-    def __init__(self):
-        self.themes = {
-            "light": Theme(
-                name="Light",
-                colors=LIGHT_THEME,
-                fonts={
-                    "primary": "system-ui, -apple-system, sans-serif",
-                    "mono": "Monaco, 'Cascadia Code', 'Roboto Mono', monospace"
-                },
-                spacing={
-                    "xs": "0.25rem",
-                    "sm": "0.5rem",
-                    "md": "1rem",
-                    "lg": "1.5rem",
-                    "xl": "2rem",
-                    "xxl": "3rem"
-                },
-                border_radius="0.5rem",
-                shadows={
-                    "sm": "0 1px 2px 0 rgba(0, 0, 0, 0.05)",
-                    "md": "0 4px 6px -1px rgba(0, 0, 0, 0.1)",
-                    "lg": "0 10px 15px -3px rgba(0, 0, 0, 0.1)"
-                }
-            ),
-            "dark": Theme(
-                name="Dark",
-                colors=DARK_THEME,
-                fonts={
-                    "primary": "system-ui, -apple-system, sans-serif",
-                    "mono": "Monaco, 'Cascadia Code', 'Roboto Mono', monospace"
-                },
-                spacing={
-                    "xs": "0.25rem",
-                    "sm": "0.5rem",
-                    "md": "1rem",
-                    "lg": "1.5rem",
-                    "xl": "2rem",
-                    "xxl": "3rem"
-                },
-                border_radius="0.5rem",
-                shadows={
-                    "sm": "0 1px 2px 0 rgba(255, 255, 255, 0.05)",
-                    "md": "0 4px 6px -1px rgba(255, 255, 255, 0.1)",
-                    "lg": "0 10px 15px -3px rgba(255, 255, 255, 0.1)"
-                }
-            )
-        }
 
-    def get_theme(self, theme_name: str = "light") -> Theme:
-        """Get a theme by name."""
-        return self.themes.get(theme_name, self.themes["light"])
+# CSS variable names for the :root block, in ThemeColors field order
+# followed by the radius, font and shadow variables
+_ROOT_KEYS = (
+    "primary-color",
+    "secondary-color",
+    "accent-color",
+    "background-color",
+    "surface-color",
+    "text-color",
+    "text-secondary-color",
+    "border-color",
+    "success-color",
+    "warning-color",
+    "error-color",
+    "info-color",
+    "border-radius",
+    "font-primary",
+    "font-mono",
+    "shadow-sm",
+    "shadow-md",
+    "shadow-lg",
+)
 
-    def get_class_theme(self, class_name: str) -> ThemeColors:
-        """Get theme colors for a WoW class."""
-        return CLASS_THEMES.get(class_name, LIGHT_THEME)
 
-    def apply_theme_css(self, theme: Theme, class_theme: Optional[ThemeColors] = None):
-        """Apply theme as custom CSS."""
-        colors = class_theme or theme.colors
+# Provider badge backgrounds, keyed by the lowercased provider name
+_PROVIDER_COLORS = {
+    "ollama": "var(--accent-color)",
+    "openai": "#10a37f",
+    "anthropic": "#d97706",
+    "google": "#ea4335",
+    "xai": "#000000",
+    "deepseek": "#7c3aed",
+}
 
-        css = f"""
-        <style>
-        :root {{
-            --primary-color: {colors.primary};
-            --secondary-color: {colors.secondary};
-            --accent-color: {colors.accent};
-            --background-color: {colors.background};
-            --surface-color: {colors.surface};
-            --text-color: {colors.text};
-            --text-secondary-color: {colors.text_secondary};
-            --border-color: {colors.border};
-            --success-color: {colors.success};
-            --warning-color: {colors.warning};
-            --error-color: {colors.error};
-            --info-color: {colors.info};
-            --border-radius: {theme.border_radius};
-            --font-primary: {theme.fonts['primary']};
-            --font-mono: {theme.fonts['mono']};
-            --shadow-sm: {theme.shadows['sm']};
-            --shadow-md: {theme.shadows['md']};
-            --shadow-lg: {theme.shadows['lg']};
+_PROVIDER_CSS = "".join(
+    f"""
+        .provider-badge.{name} {{
+            background-color: {color};
+            color: white;
         }}
+"""
+    for name, color in _PROVIDER_COLORS.items()
+)
+
+# Badge class strings for the providers above, built once
+_PROVIDER_BADGE_CLASS = {name: f"provider-badge {name}" for name in _PROVIDER_COLORS}
 
+# Rules shared by every theme; they only reference the :root CSS variables
+STATIC_CSS = (
+    """
         /* Global styling */
-        .main {{
+        .main {
             background-color: var(--background-color);
             color: var(--text-color);
             font-family: var(--font-primary);
-        }}
+        }
 
         /* Streamlit component overrides */
-        .stTextInput > div > div > input {{
+        .stTextInput > div > div > input {
             border-radius: var(--border-radius);
             border: 1px solid var(--border-color);
             background-color: var(--surface-color);
             color: var(--text-color);
-        }}
+        }
 
-        .stSelectbox > div > div {{
+        .stSelectbox > div > div {
             border-radius: var(--border-radius);
             border: 1px solid var(--border-color);
             background-color: var(--surface-color);
-        }}
+        }
 
-        .stButton > button {{
+        .stButton > button {
             border-radius: var(--border-radius);
             border: 1px solid var(--primary-color);
             background-color: var(--primary-color);
             color: white;
             font-weight: 500;
             transition: all 0.2s ease;
-        }}
+        }
 
-        .stButton > button:hover {{
+        .stButton > button:hover {
             background-color: var(--secondary-color);
             border-color: var(--secondary-color);
             transform: translateY(-1px);
             box-shadow: var(--shadow-md);
-        }}
+        }
 
         /* Chat message styling */
-        .stChatMessage {{
+        .stChatMessage {
             border-radius: var(--border-radius);
             margin: var(--spacing-sm) 0;
             padding: var(--spacing-md);
             box-shadow: var(--shadow-sm);
-        }}
+        }
 
-        .stChatMessage[data-testid="user-message"] {{
+        .stChatMessage[data-testid="user-message"] {
             background-color: var(--surface-color);
             border-left: 4px solid var(--primary-color);
-        }}
+        }
 
-        .stChatMessage[data-testid="assistant-message"] {{
+        .stChatMessage[data-testid="assistant-message"] {
             background-color: var(--surface-color);
             border-left: 4px solid var(--accent-color);
-        }}
+        }
 
         /* Sidebar styling */
-        .css-1d391kg {{
+        .css-1d391kg {
             background-color: var(--surface-color);
             border-right: 1px solid var(--border-color);
-        }}
+        }
 
         /* Expander styling */
-        .streamlit-expanderHeader {{
+        .streamlit-expanderHeader {
             background-color: var(--surface-color);
             border-radius: var(--border-radius);
             border: 1px solid var(--border-color);
-        }}
+        }
 
         /* Code blocks */
-        .stCodeBlock {{
+        .stCodeBlock {
             border-radius: var(--border-radius);
             border: 1px solid var(--border-color);
             background-color: var(--surface-color);
-        }}
+        }
 
-        pre {{
+        pre {
             background-color: var(--surface-color) !important;
             border: 1px solid var(--border-color) !important;
             border-radius: var(--border-radius) !important;
-        }}
+        }
 
-        code {{
+        code {
             background-color: var(--surface-color) !important;
             color: var(--text-color) !important;
             font-family: var(--font-mono) !important;
-        }}
+        }
 
         /* Success/Warning/Error messages */
-        .stSuccess {{
+        .stSuccess {
             background-color: rgba(40, 167, 69, 0.1);
             border-left: 4px solid var(--success-color);
             color: var(--success-color);
-        }}
+        }
 
-        .stWarning {{
+        .stWarning {
             background-color: rgba(255, 193, 7, 0.1);
             border-left: 4px solid var(--warning-color);
             color: var(--warning-color);
-        }}
+        }
 
-        .stError {{
+        .stError {
             background-color: rgba(220, 53, 69, 0.1);
             border-left: 4px solid var(--error-color);
             color: var(--error-color);
-        }}
+        }
 
-        .stInfo {{
+        .stInfo {
             background-color: rgba(23, 162, 184, 0.1);
             border-left: 4px solid var(--info-color);
             color: var(--info-color);
-        }}
+        }
 
         /* Custom conversation styling */
-        .conversation-item {{
+        .conversation-item {
             background-color: var(--surface-color);
             border: 1px solid var(--border-color);
             border-radius: var(--border-radius);
             padding: var(--spacing-md);
             margin: var(--spacing-xs) 0;
             transition: all 0.2s ease;
-        }}
+        }
 
-        .conversation-item:hover {{
+        .conversation-item:hover {
             box-shadow: var(--shadow-md);
             transform: translateY(-1px);
-        }}
+        }
 
-        .persona-badge {{
+        .persona-badge {
             background: linear-gradient(135deg, var(--primary-color), var(--secondary-color));
             color: white;
             padding: var(--spacing-xs) var(--spacing-sm);
@@ -434,16 +315,16 @@ class ThemeManager:
             font-size: 0.875rem;
             display: inline-block;
             margin: var(--spacing-xs) 0;
-        }}
+        }
 
         /* Avatar styling */
-        .avatar-large {{
+        .avatar-large {
             font-size: 2rem;
             filter: drop-shadow(var(--shadow-sm));
-        }}
+        }
 
         /* Provider badges */
-        .provider-badge {{
+        .provider-badge {
             display: inline-block;
             padding: var(--spacing-xs) var(--spacing-sm);
             border-radius: var(--border-radius);
@@ -451,76 +332,204 @@ class ThemeManager:
             font-weight: 500;
             text-transform: uppercase;
             letter-spacing: 0.05em;
-        }}
-
-        .provider-badge.ollama {{
-            background-color: var(--accent-color);
-            color: white;
-        }}
-
-        .provider-badge.openai {{
-            background-color: #10a37f;
-            color: white;
-        }}
-
-        .provider-badge.anthropic {{
-            background-color: #d97706;
-            color: white;
-        }}
-
-        .provider-badge.google {{
-            background-color: #ea4335;
-            color: white;
-        }}
-
-        .provider-badge.xai {{
-            background-color: #000000;
-            color: white;
-        }}
-
-        .provider-badge.deepseek {{
-            background-color: #7c3aed;
-            color: white;
-        }}
+        }
 
+"""
+    + _PROVIDER_CSS
+    + """
         /* Loading animation */
-        @keyframes pulse {{
-            0%, 100% {{ opacity: 1; }}
-            50% {{ opacity: 0.5; }}
-        }}
+        @keyframes pulse {
+            0%, 100% { opacity: 1; }
+            50% { opacity: 0.5; }
+        }
 
-        .loading {{
+        .loading {
             animation: pulse 2s infinite;
-        }}
+        }
 
         /* Responsive design */
-        @media (max-width: 768px) {{
-            .main {{
+        @media (max-width: 768px) {
+            .main {
                 padding: var(--spacing-sm);
-            }}
+            }
 
-            .stChatMessage {{
+            .stChatMessage {
                 margin: var(--spacing-xs) 0;
                 padding: var(--spacing-sm);
-            }}
-        }}
-        </style>
+            }
+        }
         """
+)
 
-        st.markdown(css, unsafe_allow_html=True)
 
-    def get_provider_badge_class(self, provider_name: str) -> str:
-        """Get CSS class for provider badge."""
-        return f"provider-badge {provider_name.lower()}"
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE = re.compile(r"\s+")
+_CSS_PUNCT_SPACE = re.compile(r"\s*([:;{},>])\s*")
 
-    def create_persona_badge(self, persona_name: str, cls: str, spec: str, mode: str, avatar: str) -> str:
-        """Create a styled persona badge."""
-        return f"""
+
+def _minify(css: str) -> str:
+    """Strip comments and insignificant whitespace from a stylesheet."""
+    css = _CSS_COMMENT.sub("", css)
+    css = _CSS_SPACE.sub(" ", css)
+    return _CSS_PUNCT_SPACE.sub(r"\1", css).strip()
+
+
+_STATIC_STYLE = f"<style>{_minify(STATIC_CSS)}</style>"
+
+
+@lru_cache(maxsize=64)
+def _build_css(
+    colors: ThemeColors,
+    border_radius: str,
+    font_items: Tuple[Tuple[str, str], ...],
+    shadow_items: Tuple[Tuple[str, str], ...],
+) -> str:
+    """Render the theme's :root block; cached so reruns with the same theme reuse the string."""
+    fonts = dict(font_items)
+    shadows = dict(shadow_items)
+    values = (
+        *_color_values(colors),
+        border_radius,
+        fonts["primary"],
+        fonts["mono"],
+        shadows["sm"],
+        shadows["md"],
+        shadows["lg"],
+    )
+    root = "".join([f"--{key}:{value};" for key, value in zip(_ROOT_KEYS, values)])
+    return f"<style>:root{{{root}}}</style>"
+
+
+def _render_css(theme: Theme, colors: ThemeColors) -> str:
+    """Render the :root block for a theme with the given colors."""
+    return _build_css(
+        colors,
+        theme.border_radius,
+        tuple(theme.fonts.items()),
+        tuple(theme.shadows.items()),
+    )
+
+
+# Fonts and spacing are identical across themes; every Theme shares these dicts
+_SHARED_FONTS = {
+    "primary": "system-ui, -apple-system, sans-serif",
+    "mono": "Monaco, 'Cascadia Code', 'Roboto Mono', monospace"
+}
+
+_SHARED_SPACING = {
+    "xs": "0.25rem",
+    "sm": "0.5rem",
+    "md": "1rem",
+    "lg": "1.5rem",
+    "xl": "2rem",
+    "xxl": "3rem"
+}
+
+_LIGHT_SHADOWS = {
+    "sm": "0 1px 2px 0 rgba(0, 0, 0, 0.05)",
+    "md": "0 4px 6px -1px rgba(0, 0, 0, 0.1)",
+    "lg": "0 10px 15px -3px rgba(0, 0, 0, 0.1)"
+}
+
+_DARK_SHADOWS = {
+    "sm": "0 1px 2px 0 rgba(255, 255, 255, 0.05)",
+    "md": "0 4px 6px -1px rgba(255, 255, 255, 0.1)",
+    "lg": "0 10px 15px -3px rgba(255, 255, 255, 0.1)"
+}
+
+
+def _make_light_theme() -> Theme:
+    """Build the light theme."""
+    return Theme(
+        name="Light",
+        colors=LIGHT_THEME,
+        fonts=_SHARED_FONTS,
+        spacing=_SHARED_SPACING,
+        border_radius="0.5rem",
+        shadows=_LIGHT_SHADOWS
+    )
+
+
+def _make_dark_theme() -> Theme:
+    """Build the dark theme."""
+    return Theme(
+        name="Dark",
+        colors=DARK_THEME,
+        fonts=_SHARED_FONTS,
+        spacing=_SHARED_SPACING,
+        border_radius="0.5rem",
+        shadows=_DARK_SHADOWS
+    )
+
+
+_THEME_FACTORIES = {"light": _make_light_theme, "dark": _make_dark_theme}
+
+
+@lru_cache(maxsize=256)
+def _persona_badge(persona_name: str, cls: str, spec: str, mode: str, avatar: str) -> str:
+    """Render the persona badge HTML; a chat keeps the same persona across reruns."""
+    return f"""
         <div class="persona-badge">
             {avatar} {persona_name} | {cls} / {spec} | {mode}
         </div>
         """
 
 
+class ThemeManager:
+    """Manages application theming and styling."""
+
+    def __init__(self):
+        # Themes are built on first use; most sessions only ever use one
+        self._themes: Dict[str, Theme] = {}
+        self._prerendered: Dict[Tuple[str, ThemeColors], str] = {}
+
+    @property
+    def themes(self) -> Dict[str, Theme]:
+        """All built-in themes by name."""
+        return {name: self.get_theme(name) for name in _THEME_FACTORIES}
+
+    def get_theme(self, theme_name: str = "light") -> Theme:
+        """Get a theme by name."""
+        if theme_name not in _THEME_FACTORIES:
+            theme_name = "light"
+        theme = self._themes.get(theme_name)
+        if theme is None:
+            theme = self._themes[theme_name] = _THEME_FACTORIES[theme_name]()
+            # Render the theme with its own and every class palette up front
+            for colors in (theme.colors, *CLASS_THEMES.values()):
+                self._prerendered[theme_name, colors] = _render_css(theme, colors)
+        return theme
+
+    def get_class_theme(self, class_name: str) -> ThemeColors:
+        """Get theme colors for a WoW class."""
+        return CLASS_THEMES.get(class_name, LIGHT_THEME)
+
+    def apply_base_css(self):
+        """Inject the theme-independent CSS rules (once per script run)."""
+        st.markdown(_STATIC_STYLE, unsafe_allow_html=True)
+
+    def apply_theme_css(self, theme: Theme, class_theme: Optional[ThemeColors] = None, container: Any = None):
+        """Apply theme colors, fonts and shadows as CSS variables.
+
+        Pass an ``st.empty()`` placeholder as ``container`` to replace the
+        block already written there instead of adding another one.
+        """
+        colors = class_theme or theme.colors
+        key = theme.name.lower()
+        css = self._prerendered.get((key, colors)) if self._themes.get(key) is theme else None
+        if css is None:
+            css = _render_css(theme, colors)
+        (st if container is None else container).markdown(css, unsafe_allow_html=True)
+
+    def get_provider_badge_class(self, provider_name: str) -> str:
+        """Get CSS class for provider badge."""
+        key = provider_name.lower()
+        return _PROVIDER_BADGE_CLASS.get(key) or f"provider-badge {key}"
+
+    def create_persona_badge(self, persona_name: str, cls: str, spec: str, mode: str, avatar: str) -> str:
+        """Create a styled persona badge."""
+        return _persona_badge(persona_name, cls, spec, mode, avatar)
+
+
 # Global theme manager instance
 theme_manager = ThemeManager()
\ No newline at end of file